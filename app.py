@@ -12,6 +12,12 @@ import time
 import dash
 from dash import Dash, html, dcc, Input, Output
 import dash_bootstrap_components as dbc
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 def resource_path(relative):
@@ -33,6 +39,30 @@ app = Dash(
 )
 server = app.server
 
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson (parses callback request bodies).
+
+    Dash already encodes layouts and callback responses with orjson via
+    plotly when it is installed; this covers the Flask side. Objects orjson
+    can't handle fall back to the default provider.
+    """
+
+    def dumps(self, obj, **kwargs):
+        try:
+            return orjson.dumps(
+                obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            ).decode()
+        except TypeError:
+            return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+if orjson is not None:
+    server.json = OrjsonProvider(server)
+
 app.layout = html.Div([
     dcc.Store(id='store-spss-path', storage_type='session', data=''),
     dcc.Store(id='store-meta-path', storage_type='session', data=''),
@@ -67,8 +97,19 @@ def main():
     parser = argparse.ArgumentParser()
     parser.add_argument('--port',       type=int, default=8050)
     parser.add_argument('--no-browser', action='store_true')
+    parser.add_argument('--no-meta-cache', action='store_true',
+                        help='Always re-read .sav metadata instead of using the on-disk cache')
+    parser.add_argument('--data-cache', action='store_true',
+                        help='Keep parsed .sav data in an on-disk cache between runs')
     args = parser.parse_args()
 
+    if args.no_meta_cache:
+        import config_builder
+        config_builder.META_DISK_CACHE = False
+    if args.data_cache:
+        import spss_reader
+        spss_reader.DISK_CACHE = True
+
     url = f'http://127.0.0.1:{args.port}'
     if not args.no_browser:
         def _open():
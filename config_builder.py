@@ -12,22 +12,68 @@ Launched as a subprocess by launcher.py with --spss-path and --port.
 Optional --meta-path loads an existing JSON for editing.
 """
 
-import argparse
+import functools
+import hashlib
 import json
 import os
-import sys
+import re
+import tempfile
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import count, groupby, islice
+from operator import itemgetter
 
-import pyreadstat
-from dash import Dash, html, dcc, Input, Output, State, ctx, ALL, no_update, callback
+from dash import html, dcc, Input, Output, State, ctx, ALL, MATCH, no_update, callback, clientside_callback, Patch
 import dash_bootstrap_components as dbc
 
+# orjson is optional; fall back to the stdlib encoder with matching
+# non-ASCII-escaping output.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    def _json_loads(raw):
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # orjson rejects a UTF-8 BOM and NaN/Infinity literals; json accepts both
+            return json.loads(raw)
+
+    def _json_dumps(obj):
+        return orjson.dumps(obj).decode()
+
+    def _json_dumps_file(obj):
+        """Indented UTF-8 bytes for writing a config file."""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+else:
+    _json_loads = json.loads
+
+    def _json_dumps(obj):
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+    def _json_dumps_file(obj):
+        """Indented UTF-8 bytes for writing a config file."""
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+# ambers (pure-Rust SPSS reader) parses .sav metadata much faster than
+# ReadStat. It is optional; pyreadstat remains the fallback.
+try:
+    import ambers
+except ImportError:
+    ambers = None
+
 
 # ─────────────────────────────────────────────
 # CLI
 # ─────────────────────────────────────────────
 
 def parse_arguments():
+    import argparse
+
     parser = argparse.ArgumentParser(description="SPSS Config Builder")
     parser.add_argument("--spss-path", required=True)
     parser.add_argument("--port", type=int, required=True)
@@ -43,52 +89,255 @@ def parse_arguments():
 # All SPSS format codes that indicate a date, time, or datetime variable.
 # original_variable_types values always start with one of these prefixes
 # (followed by digits for width, e.g. "DATE11", "ADATE10", "DATETIME23.6").
-_SPSS_DATE_TIME_PREFIXES = (
-    "DATE",      # dd-mmm-yyyy
-    "ADATE",     # mm/dd/yyyy  (American)
-    "EDATE",     # dd.mm.yyyy  (European)
-    "JDATE",     # Julian      yyyyddd
-    "SDATE",     # Sortable    yyyy/mm/dd
-    "QYR",       # Quarter-Year
-    "MOYR",      # Month-Year
-    "WKYR",      # Week-Year
-    "WKDAY",     # Day of week
-    "MONTH",     # Month name
-    "DATETIME",  # dd-mmm-yyyy hh:mm:ss
-    "DTIME",     # dd hh:mm:ss
-    "TIME",      # hh:mm:ss
-    "MTIME",     # mm:ss
+# Longest alternatives first so DATE does not shadow DATETIME:
+#   DATETIME  dd-mmm-yyyy hh:mm:ss     ADATE  mm/dd/yyyy  (American)
+#   EDATE     dd.mm.yyyy  (European)   JDATE  Julian      yyyyddd
+#   SDATE     Sortable    yyyy/mm/dd   DATE   dd-mmm-yyyy
+#   DTIME     dd hh:mm:ss              MTIME  mm:ss       TIME  hh:mm:ss
+#   QYR / MOYR / WKYR  Quarter/Month/Week-Year
+#   WKDAY     Day of week              MONTH  Month name
+_DT_RE = re.compile(
+    r'(?:DATETIME|ADATE|EDATE|JDATE|SDATE|DATE|DTIME|MTIME|TIME'
+    r'|QYR|MOYR|WKYR|WKDAY|MONTH)',
+    re.IGNORECASE,
 )
 
 
 def _is_datetime_format(fmt_str):
     """Return True if the SPSS original_variable_types string is a date/time format."""
-    if not fmt_str:
-        return False
-    upper = fmt_str.upper().strip()
-    return any(upper.startswith(prefix) for prefix in _SPSS_DATE_TIME_PREFIXES)
+    return bool(fmt_str) and _DT_RE.match(fmt_str.strip()) is not None
+
+
+def _read_meta_ambers(spss_path):
+    """Metadata-only read via ambers. Returns the same shape as the pyreadstat path."""
+    meta = ambers.read_sav_metadata(spss_path)
+    column_names = list(meta.schema)
+    column_labels = {}
+    value_labels_map = {}
+    original_types = {}
+    for col in column_names:
+        label = meta.label(col)
+        if label:
+            column_labels[col] = label
+        vl = meta.value(col)
+        if vl:
+            value_labels_map[col] = dict(vl)
+        original_types[col] = meta.format(col) or ""
+    # SPSS string formats are A<width> / AHEX<width>
+    string_cols = {
+        col for col, fmt in original_types.items()
+        if fmt[:1].upper() == "A" and (fmt[1:2].isdigit() or fmt[:4].upper() == "AHEX")
+    }
+    return column_names, column_labels, value_labels_map, original_types, string_cols
+
+
+def _read_meta_pyreadstat(spss_path):
+    """Metadata-only read via pyreadstat."""
+    # Imported here: pyreadstat pulls in pandas, which the builder otherwise
+    # doesn't need when ambers is available.
+    import pyreadstat
+
+    _, meta = pyreadstat.read_sav(spss_path, metadataonly=True)
+
+    readstat_types  = meta.readstat_variable_types   # {col: 'double'|'string'}
+    string_cols = {col for col, t in readstat_types.items() if t == "string"}
+    return (
+        meta.column_names,
+        meta.column_names_to_labels,
+        meta.variable_value_labels,
+        meta.original_variable_types,   # {col: 'F8.2'|'A10'|'DATE11'|...}
+        string_cols,
+    )
 
 
-def read_spss_meta(spss_path):
+# Parsed metadata keyed by (abs path, mtime_ns, size); a changed file on disk
+# gets a new key, so stale entries are never returned.
+_meta_cache = {}
+
+
+def read_spss_meta(spss_path, key=None):
     """
     Return (column_names, column_labels, value_labels_map, excluded_vars).
 
     excluded_vars is a dict  {col_name: reason}  for variables that were
     filtered out (string or datetime) so the UI can show a summary.
+
+    Results are cached per file fingerprint, so revisiting the builder for
+    an unchanged .sav skips the metadata parse. Pass key (from _file_key)
+    when the caller has already stat'ed the file.
     """
-    _, meta = pyreadstat.read_sav(spss_path, metadataonly=True)
+    if key is None:
+        key = _file_key(spss_path)
+    if key in _meta_cache:
+        return _meta_cache[key]
+    with _cache_lock:
+        pending = _meta_pending.get(key)
+    if pending is not None:
+        # A prewarm read of this file is already running
+        return pending.result()
+    if key in _meta_cache:  # a prewarm finished in the meantime
+        return _meta_cache[key]
+    return _load_spss_meta(spss_path, key)
+
+
+def _load_spss_meta(spss_path, key):
+    result = _load_meta_disk(key) if META_DISK_CACHE else None
+    if result is None:
+        result = _read_spss_meta_uncached(spss_path)
+        if META_DISK_CACHE:
+            _save_meta_disk(key, result)
+    _cache_put(_meta_cache, key, result)
+    return result
+
+
+# Background metadata reads started from the Home page as soon as a .sav is
+# picked, so the parse overlaps with the user navigating to the builder.
+_meta_pending = {}
+_prewarm_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="spss-meta")
+
+
+def prewarm_spss_meta(spss_path):
+    """Start reading spss_path's metadata in the background (no-op if cached)."""
+    try:
+        key = _file_key(spss_path)
+    except OSError:
+        return
+    with _cache_lock:
+        if key in _meta_cache or key in _meta_pending:
+            return
+        _meta_pending[key] = _prewarm_pool.submit(_prewarm_task, spss_path, key)
 
-    readstat_types  = meta.readstat_variable_types   # {col: 'double'|'string'}
-    original_types  = meta.original_variable_types   # {col: 'F8.2'|'A10'|'DATE11'|...}
+
+def _prewarm_task(spss_path, key):
+    try:
+        return _load_spss_meta(spss_path, key)
+    finally:
+        with _cache_lock:
+            _meta_pending.pop(key, None)
+
+
+def _file_key(path):
+    """Cache key that changes whenever the file is rewritten."""
+    st = os.stat(path)
+    return (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+
+# read_spss_meta results are also kept on disk so a restarted app skips the
+# parse for unchanged files. app.py --no-meta-cache turns this off.
+META_DISK_CACHE = True
+_META_DISK_DIR = os.path.join(tempfile.gettempdir(), "spss_freq_dashboard_meta")
+
+
+def _meta_disk_path(key):
+    digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+    return os.path.join(_META_DISK_DIR, f"{digest}.json")
+
+
+def _load_meta_disk(key):
+    """Return a cached read_spss_meta result for key, or None."""
+    try:
+        with open(_meta_disk_path(key), "rb") as f:
+            data = _json_loads(f.read())
+        return (
+            data["names"],
+            data["labels"],
+            # Stored as [code, label] pairs so numeric codes keep their type
+            {c: dict(pairs) for c, pairs in data["value_labels"].items()},
+            data["excluded"],
+        )
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+def _save_meta_disk(key, result):
+    """Best-effort atomic write of a read_spss_meta result."""
+    column_names, column_labels, value_labels_map, excluded = result
+    data = {
+        "names": column_names,
+        "labels": column_labels,
+        "value_labels": {c: list(vl.items()) for c, vl in value_labels_map.items()},
+        "excluded": excluded,
+    }
+    path = _meta_disk_path(key)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(_META_DISK_DIR, exist_ok=True)
+        with open(tmp, "wb") as f:
+            f.write(_json_dumps(data).encode("utf-8"))
+        os.replace(tmp, path)
+    except (OSError, TypeError, ValueError) as e:
+        print(f"⚠ Could not write metadata cache ({e})")
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+
+# Guards cache writes and _meta_pending; prewarm reads run on a worker thread.
+_cache_lock = threading.Lock()
+
+
+def _cache_put(cache, key, value):
+    """Store value under a _file_key, dropping entries for older versions of the same file."""
+    with _cache_lock:
+        for old in [k for k in cache if k[0] == key[0]]:
+            del cache[old]
+        cache[key] = value
+
+
+# The filter "Variable" dropdown only ships this many options at a time;
+# the rest are found by typing (see search_filter_vars).
+_VAR_OPTION_LIMIT = 50
+
+_var_options_cache = {}
+
+
+def _var_options(spss_path, key=None):
+    """
+    Return a tuple of (option, lowercased label) pairs for every numeric
+    variable in the file, built once per file fingerprint.
+    """
+    if key is None:
+        key = _file_key(spss_path)
+    if key not in _var_options_cache:
+        column_names, column_labels, _, _ = read_spss_meta(spss_path, key)
+        options = []
+        for c in column_names:
+            label = f"{c} — {column_labels.get(c, c)}"
+            options.append(({"label": label, "value": c}, label.lower()))
+        _cache_put(_var_options_cache, key, tuple(options))
+    return _var_options_cache[key]
+
+
+_column_set_cache = {}
+
+
+def _column_set(spss_path):
+    """Frozenset of the file's numeric variable names, for O(1) validation."""
+    key = _file_key(spss_path)
+    if key not in _column_set_cache:
+        _cache_put(_column_set_cache, key, frozenset(read_spss_meta(spss_path)[0]))
+    return _column_set_cache[key]
+
+
+def _read_spss_meta_uncached(spss_path):
+    if ambers is not None:
+        try:
+            raw = _read_meta_ambers(spss_path)
+        except Exception as e:
+            print(f"⚠ ambers metadata read failed ({e}); falling back to pyreadstat")
+            raw = _read_meta_pyreadstat(spss_path)
+    else:
+        raw = _read_meta_pyreadstat(spss_path)
+    column_names, column_labels, value_labels_map, original_types, string_cols = raw
 
     excluded = {}
     clean_names = []
 
-    for col in meta.column_names:
-        rtype = readstat_types.get(col, "")
+    for col in column_names:
         otype = original_types.get(col, "")
 
-        if rtype == "string":
+        if col in string_cols:
             excluded[col] = "string variable"
         elif _is_datetime_format(otype):
             excluded[col] = f"date/time variable ({otype})"
@@ -97,13 +346,17 @@ def read_spss_meta(spss_path):
 
     return (
         clean_names,
-        meta.column_names_to_labels,
-        meta.variable_value_labels,
+        column_labels,
+        value_labels_map,
         excluded,
     )
 
 
-def auto_detect_variables(column_names, column_labels, value_labels_map=None):
+# Trailing " - 1" / " 1" patterns that fieldwork tools add to sub labels
+_TRAIL_RE = re.compile(r'(?:\s*[-–]\s*\d+|\s+\d+)\s*\Z')
+
+
+def iter_detected_variables(column_names, column_labels, value_labels_map=None):
     """
     Heuristically group variables:
     - Columns whose name ends with _1, _2 … and share a common prefix
@@ -114,124 +367,249 @@ def auto_detect_variables(column_names, column_labels, value_labels_map=None):
     Single-punch variables get their SPSS value_labels stored in the dict
     so users can edit/reorder them in the UI.
 
-    Returns a list of variable dicts ready for the UI store.
+    Yields variable dicts ready for the UI store, in column order.
     """
-    import re
-
     # Map prefix → list of (full_name, suffix_int)
-    multi_candidates = {}
+    multi_candidates = defaultdict(list)
     for col in column_names:
-        m = re.match(r'^(.+?)_(\d+)$', col)
-        if m:
-            prefix, idx = m.group(1), int(m.group(2))
-            multi_candidates.setdefault(prefix, []).append((col, idx))
-
-    # Only treat as multi if there are at least 2 sub-variables
-    multi_prefixes = {p for p, subs in multi_candidates.items() if len(subs) >= 2}
-
-    used_as_sub = set()
-    for prefix in multi_prefixes:
-        for col, _ in multi_candidates[prefix]:
-            used_as_sub.add(col)
+        if "_" not in col:
+            continue
+        # <prefix>_<n>: split on the last underscore (isdecimal matches \d)
+        prefix, _, suffix = col.rpartition("_")
+        if prefix and suffix.isdecimal():
+            multi_candidates[prefix].append((col, int(suffix)))
+
+    # Reverse map sub-variable → parent prefix. Only treat as multi if there
+    # are at least 2 sub-variables.
+    sub_to_prefix = {
+        c: p
+        for p, subs in multi_candidates.items() if len(subs) >= 2
+        for c, _ in subs
+    }
 
-    variables = []
     seen_prefixes = set()
+    _lbl = column_labels.get
+    _vl = (value_labels_map or {}).get
 
     for col in column_names:
-        label = column_labels.get(col, col)
-
-        if col in used_as_sub:
-            prefix = next(
-                p for p in multi_prefixes
-                if col in [c for c, _ in multi_candidates[p]]
-            )
+        prefix = sub_to_prefix.get(col)
+        if prefix is not None:
             if prefix not in seen_prefixes:
                 seen_prefixes.add(prefix)
-                subs = sorted(multi_candidates[prefix], key=lambda x: x[1])
+                subs = multi_candidates[prefix]
+                # SPSS usually stores _1, _2, … in order; only sort if not
+                if any(a[1] > b[1] for a, b in zip(subs, subs[1:])):
+                    subs = sorted(subs, key=itemgetter(1))
                 sub_names = [c for c, _ in subs]
                 # Derive a label for the parent from the first sub's label or the prefix
-                parent_label = column_labels.get(sub_names[0], prefix)
+                parent_label = _lbl(sub_names[0], prefix)
                 # Strip trailing " - 1" / " 1" patterns that fieldwork tools add
-                parent_label = re.sub(r'\s*[-–]\s*\d+\s*$', '', parent_label).strip()
-                parent_label = re.sub(r'\s+\d+\s*$', '', parent_label).strip()
+                parent_label = _TRAIL_RE.sub('', parent_label).strip()
 
-                variables.append({
+                yield {
                     "id": prefix,
                     "name": prefix,
                     "label": parent_label,
                     "type": "multi",
                     "sub_variables": sub_names,
                     "sub_variable_labels": {
-                        c: column_labels.get(c, c) for c in sub_names
+                        c: _lbl(c, c) for c in sub_names
                     },
                     "value_labels": {},  # not used for multi
                     "included": True,
-                })
-        elif col not in used_as_sub:
+                }
+        else:
             # Store SPSS value labels (as string keys for JSON serialisation).
             # These become both the display labels and the display order.
-            spss_val_labels = {}
-            if value_labels_map and col in value_labels_map:
-                spss_val_labels = {
-                    str(k): v for k, v in value_labels_map[col].items()
-                }
-            variables.append({
+            raw_vl = _vl(col)
+            if not raw_vl:
+                spss_val_labels = {}
+            elif isinstance(next(iter(raw_vl)), str):
+                # String variables already have string codes
+                spss_val_labels = dict(raw_vl)
+            else:
+                spss_val_labels = {str(k): v for k, v in raw_vl.items()}
+            yield {
                 "id": col,
                 "name": col,
-                "label": label,
+                "label": _lbl(col, col),
                 "type": "single",
                 "sub_variables": [],
                 "sub_variable_labels": {},
                 "value_labels": spss_val_labels,
                 "included": True,
-            })
-
-    return variables
+            }
 
 
-def load_existing_config(meta_path, detected_vars):
+def read_existing_config(meta_path):
     """
-    Merge an existing JSON config into the detected variable list.
-    Variables in the JSON override auto-detected labels/types/groupings.
-    Variables NOT in JSON are still shown but marked included=False.
+    Read an existing JSON config.
+    Returns (existing_vars_by_name, filter_sets, passthrough).
     """
-    with open(meta_path, "r", encoding="utf-8") as f:
-        config = json.load(f)
+    with open(meta_path, "rb") as f:
+        config = _json_loads(f.read())
 
     existing = {v["name"]: v for v in config.get("variables", [])}
     filter_sets = config.get("filter_sets", {})
-
-    merged = []
-    for var in detected_vars:
-        name = var["name"]
-        if name in existing:
-            ev = existing[name]
-            var["label"] = ev.get("label", var["label"])
-            var["type"] = ev.get("type", var["type"])
-            var["sub_variables"] = ev.get("sub_variables", var["sub_variables"])
-            var["sub_variable_labels"] = ev.get(
-                "sub_variable_labels", var["sub_variable_labels"]
-            )
-            # Load custom value_labels from JSON if present; otherwise keep SPSS-derived ones
-            if "value_labels" in ev:
-                var["value_labels"] = ev["value_labels"]
-            var["included"] = True
-        else:
-            var["included"] = False
-        merged.append(var)
-
     passthrough = {
         "weighting":     config.get("weighting", {}),
         "global_filter": config.get("global_filter", None),
         "output_file":   config.get("output_file", None),
     }
-    return merged, filter_sets, passthrough
+    return existing, filter_sets, passthrough
+
+
+def merge_existing_variable(var, existing):
+    """Apply the saved settings for one detected variable in place and return it."""
+    ev = existing.get(var["name"])
+    if ev is None:
+        var["included"] = False
+        return var
+    var["label"] = ev.get("label", var["label"])
+    var["type"] = ev.get("type", var["type"])
+    var["sub_variables"] = ev.get("sub_variables", var["sub_variables"])
+    var["sub_variable_labels"] = ev.get(
+        "sub_variable_labels", var["sub_variable_labels"]
+    )
+    # Load custom value_labels from JSON if present; otherwise keep SPSS-derived ones
+    if "value_labels" in ev:
+        var["value_labels"] = ev["value_labels"]
+    var["included"] = True
+    return var
 
 
 # ─────────────────────────────────────────────
 # Layout helpers
 # ─────────────────────────────────────────────
 
+# Shared style dicts for the per-row builders below. Every card references
+# these instead of allocating identical dicts per variable / answer option.
+# Treat them as read-only.
+_OPTION_ROW_STYLE = {"display": "flex", "alignItems": "center", "marginBottom": "4px"}
+_OPTION_CODE_STYLE = {
+    "fontFamily": "monospace",
+    "fontSize": "11px",
+    "color": "#94A3B8",
+    "display": "inline-block",
+}
+_SUB_CODE_STYLE = {**_OPTION_CODE_STYLE, "minWidth": "130px"}
+_VAL_CODE_STYLE = {**_OPTION_CODE_STYLE, "minWidth": "40px"}
+_OPTION_INPUT_STYLE = {
+    "flex": "1",
+    "padding": "4px 8px",
+    "border": "1px solid #E2E8F0",
+    "borderRadius": "4px",
+    "fontSize": "12px",
+    "fontFamily": "'DM Sans', sans-serif",
+    "background": "#FAFAFA",
+    "color": "#1E293B",
+    "marginLeft": "8px",
+}
+
+_INCLUDE_OPTIONS = [{"label": "", "value": "included"}]
+_INCLUDE_CHECK_STYLE = {"display": "inline-block", "marginRight": "8px"}
+_BADGE_BASE_STYLE = {
+    "color": "white",
+    "borderRadius": "4px",
+    "padding": "2px 8px",
+    "fontSize": "11px",
+    "fontWeight": "600",
+    "letterSpacing": "0.05em",
+    "marginRight": "10px",
+    "verticalAlign": "middle",
+}
+_BADGE_MULTI_STYLE = {**_BADGE_BASE_STYLE, "background": "#7C3AED"}
+_BADGE_SINGLE_STYLE = {**_BADGE_BASE_STYLE, "background": "#0369A1"}
+_VAR_NAME_STYLE = {
+    "fontFamily": "monospace",
+    "fontSize": "12px",
+    "color": "#64748B",
+    "marginRight": "10px",
+}
+_VAR_LEFT_CLUSTER_STYLE = {"display": "flex", "alignItems": "center", "minWidth": "260px"}
+_VAR_LABEL_INPUT_STYLE = {
+    "width": "100%",
+    "padding": "6px 10px",
+    "border": "1px solid #CBD5E1",
+    "borderRadius": "6px",
+    "fontSize": "13px",
+    "fontFamily": "'DM Sans', sans-serif",
+    "background": "#FAFAFA",
+    "color": "#1E293B",
+    "outline": "none",
+}
+_VAR_LABEL_WRAP_STYLE = {"flex": "1", "marginLeft": "10px"}
+_FLEX_CENTER_STYLE = {"display": "flex", "alignItems": "center"}
+_OPTIONS_HEADING_STYLE = {
+    "fontSize": "10px",
+    "fontWeight": "600",
+    "color": "#94A3B8",
+    "letterSpacing": "0.06em",
+    "textTransform": "uppercase",
+    "marginBottom": "6px",
+    "marginTop": "2px",
+}
+_OPTIONS_TOGGLE_STYLE = {
+    **_OPTIONS_HEADING_STYLE,
+    "display": "block",
+    "background": "none",
+    "border": "none",
+    "padding": "0",
+    "cursor": "pointer",
+    "fontFamily": "'DM Sans', sans-serif",
+}
+_OPTIONS_SECTION_BASE_STYLE = {
+    "marginTop": "10px",
+    "marginLeft": "30px",
+    "paddingLeft": "12px",
+}
+_OPTIONS_SECTION_MULTI_STYLE = {**_OPTIONS_SECTION_BASE_STYLE, "borderLeft": "3px solid #EDE9FE"}
+_OPTIONS_SECTION_SINGLE_STYLE = {**_OPTIONS_SECTION_BASE_STYLE, "borderLeft": "3px solid #DBEAFE"}
+_VAR_ROW_STYLE = {
+    "padding": "12px 16px",
+    "borderBottom": "1px solid #F1F5F9",
+    "background": "white",
+    "opacity": "1",
+    "transition": "background 0.15s",
+    # Let the browser skip layout/paint for rows scrolled out of view
+    "contentVisibility": "auto",
+    "containIntrinsicSize": "auto 64px",
+}
+
+_FILTER_NAME_STYLE = {
+    "fontWeight": "600",
+    "fontSize": "13px",
+    "color": "#1E293B",
+    "minWidth": "180px",
+    "display": "inline-block",
+}
+_FILTER_COND_STYLE = {
+    "fontFamily": "monospace",
+    "fontSize": "11px",
+    "color": "#64748B",
+    "flex": "1",
+    "marginLeft": "12px",
+    "wordBreak": "break-all",
+}
+_FILTER_BODY_STYLE = {"display": "flex", "alignItems": "center", "flex": "1"}
+_FILTER_X_BTN_STYLE = {
+    "background": "none",
+    "border": "none",
+    "color": "#EF4444",
+    "fontSize": "16px",
+    "cursor": "pointer",
+    "padding": "0 4px",
+    "marginLeft": "8px",
+}
+_FILTER_ROW_STYLE = {
+    "display": "flex",
+    "alignItems": "center",
+    "padding": "10px 16px",
+    "borderBottom": "1px solid #F1F5F9",
+    "background": "white",
+}
+
+
 def _make_answer_option_rows(var, idx):
     """Build editable answer option rows for a variable.
     For single: editable value label text.
@@ -247,35 +625,16 @@ def _make_answer_option_rows(var, idx):
             rows.append(
                 html.Div(
                     [
-                        html.Span(
-                            sv,
-                            style={
-                                "fontFamily": "monospace",
-                                "fontSize": "11px",
-                                "color": "#94A3B8",
-                                "minWidth": "130px",
-                                "display": "inline-block",
-                            },
-                        ),
+                        html.Span(sv, style=_SUB_CODE_STYLE),
                         dcc.Input(
                             id={"type": "sub-label", "var_idx": idx, "sub_idx": sub_idx},
                             value=sv_label,
                             debounce=True,
                             placeholder=sv,
-                            style={
-                                "flex": "1",
-                                "padding": "4px 8px",
-                                "border": "1px solid #E2E8F0",
-                                "borderRadius": "4px",
-                                "fontSize": "12px",
-                                "fontFamily": "'DM Sans', sans-serif",
-                                "background": "#FAFAFA",
-                                "color": "#1E293B",
-                                "marginLeft": "8px",
-                            },
+                            style=_OPTION_INPUT_STYLE,
                         ),
                     ],
-                    style={"display": "flex", "alignItems": "center", "marginBottom": "4px"},
+                    style=_OPTION_ROW_STYLE,
                 )
             )
     else:
@@ -284,49 +643,42 @@ def _make_answer_option_rows(var, idx):
             rows.append(
                 html.Div(
                     [
-                        html.Span(
-                            val_code,
-                            style={
-                                "fontFamily": "monospace",
-                                "fontSize": "11px",
-                                "color": "#94A3B8",
-                                "minWidth": "40px",
-                                "display": "inline-block",
-                            },
-                        ),
+                        html.Span(val_code, style=_VAL_CODE_STYLE),
                         dcc.Input(
                             id={"type": "val-label", "var_idx": idx, "val_code": val_code},
                             value=val_label,
                             debounce=True,
                             placeholder=val_code,
-                            style={
-                                "flex": "1",
-                                "padding": "4px 8px",
-                                "border": "1px solid #E2E8F0",
-                                "borderRadius": "4px",
-                                "fontSize": "12px",
-                                "fontFamily": "'DM Sans', sans-serif",
-                                "background": "#FAFAFA",
-                                "color": "#1E293B",
-                                "marginLeft": "8px",
-                            },
+                            style=_OPTION_INPUT_STYLE,
                         ),
                     ],
-                    style={"display": "flex", "alignItems": "center", "marginBottom": "4px"},
+                    style=_OPTION_ROW_STYLE,
                 )
             )
 
     return rows
 
 
+def _options_toggle_label(var, is_open):
+    """Heading text for the collapsible answer-options section."""
+    if var["type"] == "multi":
+        title, n = "Sub-variables", len(var["sub_variables"])
+    else:
+        title, n = "Answer options", len(var.get("value_labels", {}))
+    return f"{'▾' if is_open else '▸'} {title} ({n})"
+
+
 def make_variable_card(var, idx):
-    """Render one variable row with editable title and answer options."""
+    """Render one variable row with editable title and answer options.
+
+    The answer-option inputs are not built here; they are created by
+    toggle_answer_options the first time the section is expanded.
+    """
     is_multi = var["type"] == "multi"
-    badge_color = "#7C3AED" if is_multi else "#0369A1"
     badge_text = "MULTI" if is_multi else "SINGLE"
     included = var.get("included", True)
 
-    answer_rows = _make_answer_option_rows(var, idx)
+    has_options = bool(var["sub_variables"] if is_multi else var.get("value_labels"))
 
     return html.Div(
         [
@@ -338,35 +690,17 @@ def make_variable_card(var, idx):
                         [
                             dcc.Checklist(
                                 id={"type": "var-include", "index": idx},
-                                options=[{"label": "", "value": "included"}],
+                                options=_INCLUDE_OPTIONS,
                                 value=["included"] if included else [],
-                                style={"display": "inline-block", "marginRight": "8px"},
+                                style=_INCLUDE_CHECK_STYLE,
                             ),
                             html.Span(
                                 badge_text,
-                                style={
-                                    "background": badge_color,
-                                    "color": "white",
-                                    "borderRadius": "4px",
-                                    "padding": "2px 8px",
-                                    "fontSize": "11px",
-                                    "fontWeight": "600",
-                                    "letterSpacing": "0.05em",
-                                    "marginRight": "10px",
-                                    "verticalAlign": "middle",
-                                },
-                            ),
-                            html.Span(
-                                var["name"],
-                                style={
-                                    "fontFamily": "monospace",
-                                    "fontSize": "12px",
-                                    "color": "#64748B",
-                                    "marginRight": "10px",
-                                },
+                                style=_BADGE_MULTI_STYLE if is_multi else _BADGE_SINGLE_STYLE,
                             ),
+                            html.Span(var["name"], style=_VAR_NAME_STYLE),
                         ],
-                        style={"display": "flex", "alignItems": "center", "minWidth": "260px"},
+                        style=_VAR_LEFT_CLUSTER_STYLE,
                     ),
                     # Right: editable question title
                     html.Div(
@@ -375,138 +709,352 @@ def make_variable_card(var, idx):
                             value=var["label"],
                             debounce=True,
                             placeholder="Question label…",
-                            style={
-                                "width": "100%",
-                                "padding": "6px 10px",
-                                "border": "1px solid #CBD5E1",
-                                "borderRadius": "6px",
-                                "fontSize": "13px",
-                                "fontFamily": "'DM Sans', sans-serif",
-                                "background": "#FAFAFA",
-                                "color": "#1E293B",
-                                "outline": "none",
-                            },
+                            style=_VAR_LABEL_INPUT_STYLE,
                         ),
-                        style={"flex": "1", "marginLeft": "10px"},
+                        style=_VAR_LABEL_WRAP_STYLE,
                     ),
                 ],
-                style={"display": "flex", "alignItems": "center"},
+                style=_FLEX_CENTER_STYLE,
             ),
             # ── Answer options section ──────────────────────────────────
             html.Div(
                 [
-                    html.Div(
-                        "Answer options" if not is_multi else "Sub-variables",
-                        style={
-                            "fontSize": "10px",
-                            "fontWeight": "600",
-                            "color": "#94A3B8",
-                            "letterSpacing": "0.06em",
-                            "textTransform": "uppercase",
-                            "marginBottom": "6px",
-                            "marginTop": "2px",
-                        },
+                    html.Button(
+                        _options_toggle_label(var, False),
+                        id={"type": "var-toggle", "index": idx},
+                        n_clicks=0,
+                        style=_OPTIONS_TOGGLE_STYLE,
+                    ),
+                    dbc.Collapse(
+                        [],
+                        id={"type": "var-collapse", "index": idx},
+                        is_open=False,
                     ),
-                    html.Div(answer_rows),
                 ],
-                style={
-                    "marginTop": "10px",
-                    "marginLeft": "30px",
-                    "paddingLeft": "12px",
-                    "borderLeft": f"3px solid {'#EDE9FE' if is_multi else '#DBEAFE'}",
-                },
-            ) if answer_rows else None,
-            # Hidden store for variable metadata (sub_variables list for multi)
-            dcc.Store(
-                id={"type": "var-meta", "index": idx},
-                data={
-                    "name": var["name"],
-                    "type": var["type"],
-                    "sub_variables": var["sub_variables"],
-                    "sub_variable_labels": var["sub_variable_labels"],
-                    "value_labels": var.get("value_labels", {}),
-                },
-            ),
+                style=_OPTIONS_SECTION_MULTI_STYLE if is_multi else _OPTIONS_SECTION_SINGLE_STYLE,
+            ) if has_options else None,
         ],
-        style={
-            "padding": "12px 16px",
-            "borderBottom": "1px solid #F1F5F9",
-            "background": "white",
-            "opacity": "1",
-            "transition": "background 0.15s",
-        },
+        style=_VAR_ROW_STYLE,
         id={"type": "var-row", "index": idx},
     )
 
 
-def make_filter_card(name, conditions, idx):
-    """Render one filter row."""
-    conditions_str = json.dumps(conditions, indent=None)
+# Variable cards are mounted in batches so very wide .sav files don't ship
+# thousands of rows in the initial layout.
+_CARD_BATCH = 200
+
+_MORE_BTN_STYLE = {
+    "width": "100%",
+    "background": "#F8FAFC",
+    "border": "none",
+    "borderTop": "1px solid #E2E8F0",
+    "color": "#475569",
+    "padding": "10px",
+    "fontSize": "12px",
+    "fontWeight": "500",
+    "cursor": "pointer",
+    "fontFamily": "'DM Sans', sans-serif",
+}
+_HIDDEN_STYLE = {"display": "none"}
+
+
+def _more_button_props(rendered, total):
+    """Return (label, style) for the "show more variables" button."""
+    remaining = total - rendered
+    if remaining <= 0:
+        return "", _HIDDEN_STYLE
+    return f"Show {min(remaining, _CARD_BATCH)} more of {remaining} remaining", _MORE_BTN_STYLE
+
+
+def make_filter_card(name, conditions):
+    """Render one filter row. Rows are keyed by filter name, which is unique."""
+    conditions_str = _json_dumps(conditions)
     return html.Div(
         [
             html.Div(
                 [
-                    html.Span(
-                        name,
+                    html.Span(name, style=_FILTER_NAME_STYLE),
+                    html.Span(conditions_str, style=_FILTER_COND_STYLE),
+                ],
+                style=_FILTER_BODY_STYLE,
+            ),
+            html.Button(
+                "✕",
+                id={"type": "remove-filter", "index": name},
+                n_clicks=0,
+                style=_FILTER_X_BTN_STYLE,
+            ),
+        ],
+        style=_FILTER_ROW_STYLE,
+        id={"type": "filter-row", "index": name},
+    )
+
+
+# ─────────────────────────────────────────────
+# App factory
+# ─────────────────────────────────────────────
+
+
+# Layout builder: form field labels, filter form columns and dropdowns
+_FIELD_LABEL_STYLE = {
+    "fontSize": "11px",
+    "fontWeight": "600",
+    "color": "#64748B",
+    "display": "block",
+    "marginBottom": "4px",
+}
+_FILTER_FIELD_STYLE = {"flex": "1", "marginRight": "8px"}
+_DROPDOWN_STYLE = {"fontSize": "13px"}
+_SUBTITLE_STYLE = {"fontSize": "11px", "color": "#94A3B8"}
+
+
+# ── static layout pieces ─────────────────────────────────────────────────
+# These sections do not depend on the loaded file, so they are built once
+# and shared by every create_app() call.
+
+@functools.lru_cache(maxsize=1)
+def _variables_header():
+    """Variables column heading with the global select-all checkbox."""
+    return html.Div(
+        [
+            html.Div(
+                [
+                    html.H2(
+                        "Variables",
                         style={
+                            "fontSize": "15px",
                             "fontWeight": "600",
-                            "fontSize": "13px",
                             "color": "#1E293B",
-                            "minWidth": "180px",
-                            "display": "inline-block",
+                            "margin": "0 0 2px 0",
                         },
                     ),
                     html.Span(
-                        conditions_str,
-                        style={
-                            "fontFamily": "monospace",
-                            "fontSize": "11px",
-                            "color": "#64748B",
-                            "flex": "1",
-                            "marginLeft": "12px",
-                            "wordBreak": "break-all",
-                        },
+                        "Check to include · Edit label in the text box",
+                        style=_SUBTITLE_STYLE,
                     ),
                 ],
-                style={"display": "flex", "alignItems": "center", "flex": "1"},
+            ),
+            # Global select / deselect
+            html.Div(
+                [
+                    dcc.Checklist(
+                        id="global-select-all",
+                        options=[{"label": " Select all", "value": "all"}],
+                        value=["all"],  # all selected by default
+                        style={"display": "inline-flex", "alignItems": "center"},
+                        inputStyle={"marginRight": "5px", "cursor": "pointer"},
+                        labelStyle={"fontSize": "12px", "color": "#475569", "cursor": "pointer", "fontWeight": "500"},
+                    ),
+                ],
+                style=_FLEX_CENTER_STYLE,
+            ),
+        ],
+        style={
+            "padding": "12px 16px",
+            "borderBottom": "2px solid #E2E8F0",
+            "display": "flex",
+            "justifyContent": "space-between",
+            "alignItems": "center",
+        },
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _filters_header():
+    """Filter Sets column heading."""
+    return html.Div(
+        [
+            html.H2(
+                "Filter Sets",
+                style={
+                    "fontSize": "15px",
+                    "fontWeight": "600",
+                    "color": "#1E293B",
+                    "margin": "0 0 4px 0",
+                },
+            ),
+            html.Span(
+                "Define named filters. Conditions use JSON syntax.",
+                style=_SUBTITLE_STYLE,
+            ),
+        ],
+        style={
+            "padding": "16px",
+            "borderBottom": "2px solid #E2E8F0",
+        },
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _filter_form_fields():
+    """Name, operator, value and add-button fields of the add-filter form."""
+    name_field = html.Div(
+        [
+            html.Label(
+                "Filter Name",
+                style=_FIELD_LABEL_STYLE,
+            ),
+            dcc.Input(
+                id="new-filter-name",
+                placeholder='e.g. "AGE 23-30"',
+                debounce=False,
+                style={
+                    "width": "100%",
+                    "padding": "7px 10px",
+                    "border": "1px solid #CBD5E1",
+                    "borderRadius": "6px",
+                    "fontSize": "13px",
+                    "fontFamily": "'DM Sans', sans-serif",
+                },
+            ),
+        ],
+        style=_FILTER_FIELD_STYLE,
+    )
+    op_field = html.Div(
+        [
+            html.Label(
+                "Operator",
+                style=_FIELD_LABEL_STYLE,
+            ),
+            dcc.Dropdown(
+                id="new-filter-op",
+                options=[
+                    {"label": "equals (eq)", "value": "eq"},
+                    {"label": "in list (in)", "value": "in"},
+                    {"label": "between", "value": "between"},
+                    {"label": "not missing", "value": "not_missing"},
+                ],
+                placeholder="Operator",
+                clearable=True,
+                style=_DROPDOWN_STYLE,
+            ),
+        ],
+        style=_FILTER_FIELD_STYLE,
+    )
+    value_field = html.Div(
+        [
+            html.Label(
+                "Value(s)",
+                style=_FIELD_LABEL_STYLE,
+            ),
+            dcc.Input(
+                id="new-filter-value",
+                placeholder="e.g. 1  or  1,2,3",
+                debounce=False,
+                style={
+                    "width": "100%",
+                    "padding": "7px 10px",
+                    "border": "1px solid #CBD5E1",
+                    "borderRadius": "6px",
+                    "fontSize": "13px",
+                    "fontFamily": "'DM Mono', monospace",
+                },
+            ),
+        ],
+        style=_FILTER_FIELD_STYLE,
+    )
+    add_field = html.Div(
+        [
+            html.Label(
+                "\u00a0",
+                style={
+                    "display": "block",
+                    "marginBottom": "4px",
+                    "fontSize": "11px",
+                },
             ),
             html.Button(
-                "✕",
-                id={"type": "remove-filter", "index": idx},
+                "+ Add",
+                id="add-filter-btn",
                 n_clicks=0,
                 style={
-                    "background": "none",
+                    "background": "#0F172A",
+                    "color": "white",
                     "border": "none",
-                    "color": "#EF4444",
-                    "fontSize": "16px",
+                    "borderRadius": "6px",
+                    "padding": "7px 14px",
+                    "fontSize": "13px",
                     "cursor": "pointer",
-                    "padding": "0 4px",
-                    "marginLeft": "8px",
+                    "fontFamily": "'DM Sans', sans-serif",
+                    "whiteSpace": "nowrap",
                 },
             ),
-            dcc.Store(
-                id={"type": "filter-meta", "index": idx},
-                data={"name": name, "conditions": conditions},
-            ),
         ],
+    )
+    return name_field, op_field, value_field, add_field
+
+
+@functools.lru_cache(maxsize=1)
+def _save_controls():
+    """Save button and its status line."""
+    save_btn = html.Button(
+        "💾  Save JSON",
+        id="save-btn",
+        n_clicks=0,
         style={
-            "display": "flex",
-            "alignItems": "center",
-            "padding": "10px 16px",
-            "borderBottom": "1px solid #F1F5F9",
-            "background": "white",
+            "width": "100%",
+            "background": "#059669",
+            "color": "white",
+            "border": "none",
+            "borderRadius": "8px",
+            "padding": "12px",
+            "fontSize": "14px",
+            "fontWeight": "600",
+            "cursor": "pointer",
+            "fontFamily": "'DM Sans', sans-serif",
+            "letterSpacing": "0.02em",
         },
-        id={"type": "filter-row", "index": idx},
     )
+    save_status = html.Div(
+        id="save-status",
+        style={
+            "marginTop": "10px",
+            "fontSize": "13px",
+            "textAlign": "center",
+            "minHeight": "20px",
+        },
+    )
+    return save_btn, save_status
 
 
-# ─────────────────────────────────────────────
-# App factory
-# ─────────────────────────────────────────────
+def _builder_variables(column_names, column_labels, value_labels_map, meta_path):
+    """Detect variables and merge meta_path's saved settings in the same pass.
+    Returns (variables, filter_sets, passthrough)."""
+    existing = None
+    filter_sets = {}
+    passthrough = {"weighting": {}, "global_filter": None, "output_file": None}
+    if meta_path:
+        try:
+            existing, filter_sets, passthrough = read_existing_config(meta_path)
+        except FileNotFoundError:
+            pass  # new config; it will be created on save
+
+    detected = iter_detected_variables(column_names, column_labels, value_labels_map)
+    if existing is not None:
+        return [merge_existing_variable(v, existing) for v in detected], filter_sets, passthrough
+    return list(detected), filter_sets, passthrough
+
+
+_initial_variables_cache = {}
+
+
+def _initial_variables(spss_path, meta_path):
+    """The variable list create_app starts from, rebuilt server-side so
+    answer-option rows can be made without uploading store-variables."""
+    spss_key = _file_key(spss_path)
+    meta_key = _file_key(meta_path)[1:] if meta_path and os.path.exists(meta_path) else None
+    key = spss_key + (meta_path, meta_key)
+    if key not in _initial_variables_cache:
+        column_names, column_labels, value_labels_map, _ = read_spss_meta(spss_path, spss_key)
+        variables = _builder_variables(column_names, column_labels, value_labels_map, meta_path)[0]
+        _cache_put(_initial_variables_cache, key, variables)
+    return _initial_variables_cache[key]
+
 
 def create_app(spss_path, meta_path=None):
-    column_names, column_labels, value_labels_map, excluded_vars = read_spss_meta(spss_path)
-    detected = auto_detect_variables(column_names, column_labels, value_labels_map)
+    # One stat of the .sav; raises FileNotFoundError if it has gone missing
+    spss_key = _file_key(spss_path)
+    column_names, column_labels, value_labels_map, excluded_vars = read_spss_meta(spss_path, spss_key)
 
     # Log excluded variables to console
     if excluded_vars:
@@ -514,10 +1062,8 @@ def create_app(spss_path, meta_path=None):
         for col, reason in excluded_vars.items():
             print(f"    x {col}  ({reason})")
 
-    initial_filters = {}
-    initial_passthrough = {"weighting": {}, "global_filter": None, "output_file": None}
-    if meta_path and os.path.exists(meta_path):
-        detected, initial_filters, initial_passthrough = load_existing_config(meta_path, detected)
+    detected, initial_filters, initial_passthrough = _builder_variables(
+        column_names, column_labels, value_labels_map, meta_path)
 
     # Unpack weighting for UI pre-population
     init_w = initial_passthrough.get("weighting", {})
@@ -543,15 +1089,29 @@ def create_app(spss_path, meta_path=None):
         f"{len(column_names)} numeric shown{excluded_note}"
     )
 
+    # Shared option dicts for the filter and weight variable dropdowns
+    var_options = _var_options(spss_path, spss_key)
+
+    rendered_cards = min(len(detected), _CARD_BATCH)
+    more_label, more_style = _more_button_props(rendered_cards, len(detected))
+
+    name_field, op_field, value_field, add_field = _filter_form_fields()
+    save_btn, save_status = _save_controls()
+
     # ── layout ──────────────────────────────────────────────────────────────
     _layout = html.Div(
         [
             # Stores
             dcc.Store(id="store-variables", data=detected),
+            dcc.Store(id="store-rendered-cards", data=rendered_cards),
             dcc.Store(id="store-passthrough", data=initial_passthrough),
             dcc.Store(id="store-filters", data=initial_filters),
             dcc.Store(id="store-save-path", data=default_save_path),
-            dcc.Store(id="store-removed-filters", data=[]),
+            dcc.Store(id="store-spss-file", data=spss_path),
+            dcc.Store(id="store-meta-file", data=meta_path),
+            dcc.Store(id="store-filter-var-search"),
+            dcc.Store(id="store-save-job"),
+            dcc.Interval(id="save-poll", interval=200, disabled=True),
 
             # Header bar
             html.Div(
@@ -569,7 +1129,7 @@ def create_app(spss_path, meta_path=None):
                                         style={"fontWeight": "600", "fontSize": "17px"},
                                     ),
                                 ],
-                                style={"display": "flex", "alignItems": "center"},
+                                style=_FLEX_CENTER_STYLE,
                             ),
                             html.Span(
                                 header_subtitle,
@@ -604,51 +1164,23 @@ def create_app(spss_path, meta_path=None):
                     # ── Left column: variables ──────────────────────
                     html.Div(
                         [
+                            _variables_header(),
                             html.Div(
                                 [
                                     html.Div(
                                         [
-                                            html.H2(
-                                                "Variables",
-                                                style={
-                                                    "fontSize": "15px",
-                                                    "fontWeight": "600",
-                                                    "color": "#1E293B",
-                                                    "margin": "0 0 2px 0",
-                                                },
-                                            ),
-                                            html.Span(
-                                                "Check to include · Edit label in the text box",
-                                                style={"fontSize": "11px", "color": "#94A3B8"},
-                                            ),
+                                            make_variable_card(v, i)
+                                            for i, v in enumerate(islice(detected, _CARD_BATCH))
                                         ],
+                                        id="variable-list",
                                     ),
-                                    # Global select / deselect
-                                    html.Div(
-                                        [
-                                            dcc.Checklist(
-                                                id="global-select-all",
-                                                options=[{"label": " Select all", "value": "all"}],
-                                                value=["all"],  # all selected by default
-                                                style={"display": "inline-flex", "alignItems": "center"},
-                                                inputStyle={"marginRight": "5px", "cursor": "pointer"},
-                                                labelStyle={"fontSize": "12px", "color": "#475569", "cursor": "pointer", "fontWeight": "500"},
-                                            ),
-                                        ],
-                                        style={"display": "flex", "alignItems": "center"},
+                                    html.Button(
+                                        more_label,
+                                        id="variable-list-more",
+                                        n_clicks=0,
+                                        style=more_style,
                                     ),
                                 ],
-                                style={
-                                    "padding": "12px 16px",
-                                    "borderBottom": "2px solid #E2E8F0",
-                                    "display": "flex",
-                                    "justifyContent": "space-between",
-                                    "alignItems": "center",
-                                },
-                            ),
-                            html.Div(
-                                [make_variable_card(v, i) for i, v in enumerate(detected)],
-                                id="variable-list",
                                 style={"overflowY": "auto", "maxHeight": "calc(100vh - 220px)"},
                             ),
                         ],
@@ -666,33 +1198,13 @@ def create_app(spss_path, meta_path=None):
                     html.Div(
                         [
                             # Filter builder
-                            html.Div(
-                                [
-                                    html.H2(
-                                        "Filter Sets",
-                                        style={
-                                            "fontSize": "15px",
-                                            "fontWeight": "600",
-                                            "color": "#1E293B",
-                                            "margin": "0 0 4px 0",
-                                        },
-                                    ),
-                                    html.Span(
-                                        "Define named filters. Conditions use JSON syntax.",
-                                        style={"fontSize": "11px", "color": "#94A3B8"},
-                                    ),
-                                ],
-                                style={
-                                    "padding": "16px",
-                                    "borderBottom": "2px solid #E2E8F0",
-                                },
-                            ),
+                            _filters_header(),
 
                             html.Div(
                                 id="filter-list",
                                 children=[
-                                    make_filter_card(n, c, i)
-                                    for i, (n, c) in enumerate(initial_filters.items())
+                                    make_filter_card(n, c)
+                                    for n, c in initial_filters.items()
                                 ],
                                 style={"maxHeight": "280px", "overflowY": "auto"},
                             ),
@@ -700,142 +1212,28 @@ def create_app(spss_path, meta_path=None):
                             # Add filter form
                             html.Div(
                                 [
-                                    html.Div(
-                                        [
-                                            html.Label(
-                                                "Filter Name",
-                                                style={
-                                                    "fontSize": "11px",
-                                                    "fontWeight": "600",
-                                                    "color": "#64748B",
-                                                    "display": "block",
-                                                    "marginBottom": "4px",
-                                                },
-                                            ),
-                                            dcc.Input(
-                                                id="new-filter-name",
-                                                placeholder='e.g. "AGE 23-30"',
-                                                debounce=False,
-                                                style={
-                                                    "width": "100%",
-                                                    "padding": "7px 10px",
-                                                    "border": "1px solid #CBD5E1",
-                                                    "borderRadius": "6px",
-                                                    "fontSize": "13px",
-                                                    "fontFamily": "'DM Sans', sans-serif",
-                                                },
-                                            ),
-                                        ],
-                                        style={"flex": "1", "marginRight": "8px"},
-                                    ),
+                                    name_field,
                                     html.Div(
                                         [
                                             html.Label(
                                                 "Variable",
-                                                style={
-                                                    "fontSize": "11px",
-                                                    "fontWeight": "600",
-                                                    "color": "#64748B",
-                                                    "display": "block",
-                                                    "marginBottom": "4px",
-                                                },
+                                                style=_FIELD_LABEL_STYLE,
                                             ),
                                             dcc.Dropdown(
                                                 id="new-filter-var",
                                                 options=[
-                                                    {"label": f"{c} — {column_labels.get(c,c)}", "value": c}
-                                                    for c in column_names
+                                                    o for o, _ in islice(var_options, _VAR_OPTION_LIMIT)
                                                 ],
                                                 placeholder="Variable",
                                                 clearable=True,
-                                                style={"fontSize": "13px"},
-                                            ),
-                                        ],
-                                        style={"flex": "1", "marginRight": "8px"},
-                                    ),
-                                    html.Div(
-                                        [
-                                            html.Label(
-                                                "Operator",
-                                                style={
-                                                    "fontSize": "11px",
-                                                    "fontWeight": "600",
-                                                    "color": "#64748B",
-                                                    "display": "block",
-                                                    "marginBottom": "4px",
-                                                },
-                                            ),
-                                            dcc.Dropdown(
-                                                id="new-filter-op",
-                                                options=[
-                                                    {"label": "equals (eq)", "value": "eq"},
-                                                    {"label": "in list (in)", "value": "in"},
-                                                    {"label": "between", "value": "between"},
-                                                    {"label": "not missing", "value": "not_missing"},
-                                                ],
-                                                placeholder="Operator",
-                                                clearable=True,
-                                                style={"fontSize": "13px"},
-                                            ),
-                                        ],
-                                        style={"flex": "1", "marginRight": "8px"},
-                                    ),
-                                    html.Div(
-                                        [
-                                            html.Label(
-                                                "Value(s)",
-                                                style={
-                                                    "fontSize": "11px",
-                                                    "fontWeight": "600",
-                                                    "color": "#64748B",
-                                                    "display": "block",
-                                                    "marginBottom": "4px",
-                                                },
-                                            ),
-                                            dcc.Input(
-                                                id="new-filter-value",
-                                                placeholder="e.g. 1  or  1,2,3",
-                                                debounce=False,
-                                                style={
-                                                    "width": "100%",
-                                                    "padding": "7px 10px",
-                                                    "border": "1px solid #CBD5E1",
-                                                    "borderRadius": "6px",
-                                                    "fontSize": "13px",
-                                                    "fontFamily": "'DM Mono', monospace",
-                                                },
-                                            ),
-                                        ],
-                                        style={"flex": "1", "marginRight": "8px"},
-                                    ),
-                                    html.Div(
-                                        [
-                                            html.Label(
-                                                "\u00a0",
-                                                style={
-                                                    "display": "block",
-                                                    "marginBottom": "4px",
-                                                    "fontSize": "11px",
-                                                },
-                                            ),
-                                            html.Button(
-                                                "+ Add",
-                                                id="add-filter-btn",
-                                                n_clicks=0,
-                                                style={
-                                                    "background": "#0F172A",
-                                                    "color": "white",
-                                                    "border": "none",
-                                                    "borderRadius": "6px",
-                                                    "padding": "7px 14px",
-                                                    "fontSize": "13px",
-                                                    "cursor": "pointer",
-                                                    "fontFamily": "'DM Sans', sans-serif",
-                                                    "whiteSpace": "nowrap",
-                                                },
+                                                style=_DROPDOWN_STYLE,
                                             ),
                                         ],
+                                        style=_FILTER_FIELD_STYLE,
                                     ),
+                                    op_field,
+                                    value_field,
+                                    add_field,
                                 ],
                                 style={
                                     "display": "flex",
@@ -877,21 +1275,16 @@ def create_app(spss_path, meta_path=None):
                                         [
                                             html.Label(
                                                 "Weight variable",
-                                                style={"fontSize": "11px", "fontWeight": "600",
-                                                       "color": "#64748B", "display": "block",
-                                                       "marginBottom": "4px"},
+                                                style=_FIELD_LABEL_STYLE,
                                             ),
                                             dcc.Dropdown(
                                                 id="weight-variable",
-                                                options=[
-                                                    {"label": f"{c} — {column_labels.get(c, c)}", "value": c}
-                                                    for c in column_names
-                                                ],
+                                                options=[o for o, _ in var_options],
                                                 value=init_w_var,
                                                 placeholder="Select weight variable…",
                                                 clearable=True,
                                                 disabled=not init_w_enabled,
-                                                style={"fontSize": "13px"},
+                                                style=_DROPDOWN_STYLE,
                                             ),
                                         ],
                                         id="weight-var-row",
@@ -920,7 +1313,7 @@ def create_app(spss_path, meta_path=None):
                                         value=init_global_filter,
                                         placeholder="None (no default filter)",
                                         clearable=True,
-                                        style={"fontSize": "13px"},
+                                        style=_DROPDOWN_STYLE,
                                     ),
                                     html.Span(
                                         "Applied automatically when the dashboard opens",
@@ -961,33 +1354,8 @@ def create_app(spss_path, meta_path=None):
                                             "marginBottom": "10px",
                                         },
                                     ),
-                                    html.Button(
-                                        "💾  Save JSON",
-                                        id="save-btn",
-                                        n_clicks=0,
-                                        style={
-                                            "width": "100%",
-                                            "background": "#059669",
-                                            "color": "white",
-                                            "border": "none",
-                                            "borderRadius": "8px",
-                                            "padding": "12px",
-                                            "fontSize": "14px",
-                                            "fontWeight": "600",
-                                            "cursor": "pointer",
-                                            "fontFamily": "'DM Sans', sans-serif",
-                                            "letterSpacing": "0.02em",
-                                        },
-                                    ),
-                                    html.Div(
-                                        id="save-status",
-                                        style={
-                                            "marginTop": "10px",
-                                            "fontSize": "13px",
-                                            "textAlign": "center",
-                                            "minHeight": "20px",
-                                        },
-                                    ),
+                                    save_btn,
+                                    save_status,
                                 ],
                                 style={
                                     "padding": "16px",
@@ -1031,6 +1399,74 @@ def create_app(spss_path, meta_path=None):
 
 # ── callbacks ────────────────────────────────────────────────────────────
 
+def _global_select_value(included_flags):
+    """Mirror the global checkbox: all=checked, none=unchecked, mixed=leave."""
+    # Single pass that stops as soon as the selection is known to be mixed
+    seen_on = seen_off = False
+    for flag in included_flags:
+        if flag:
+            seen_on = True
+        else:
+            seen_off = True
+        if seen_on and seen_off:
+            return no_update
+    return [] if seen_off else ["all"]
+
+
+def _patch_single_edit(trig_id, value, current):
+    """
+    Return (Patch, global-select value) for one edited input, or None when
+    the edit can't be applied directly and the full merge should run.
+    """
+    kind = trig_id.get("type")
+    patch = Patch()
+
+    if kind == "var-include":
+        i = trig_id["index"]
+        if i >= len(current):
+            return None
+        included = bool(value)
+        patch[i]["included"] = included
+        flags = (
+            included if j == i else v.get("included", True)
+            for j, v in enumerate(current)
+        )
+        return patch, _global_select_value(flags)
+
+    if kind == "var-label":
+        i = trig_id["index"]
+        if i >= len(current):
+            return None
+        if not value:
+            return no_update, no_update
+        patch[i]["label"] = value
+        return patch, no_update
+
+    if kind == "sub-label":
+        i, s_idx = trig_id["var_idx"], trig_id["sub_idx"]
+        if i >= len(current):
+            return None
+        sv_list = current[i].get("sub_variables", [])
+        if value is None or s_idx >= len(sv_list) or "sub_variable_labels" not in current[i]:
+            return None
+        patch[i]["sub_variable_labels"][sv_list[s_idx]] = value
+        return patch, no_update
+
+    if kind == "val-label":
+        i = trig_id["var_idx"]
+        if i >= len(current) or value is None or "value_labels" not in current[i]:
+            return None
+        patch[i]["value_labels"][trig_id["val_code"]] = value
+        return patch, no_update
+
+    return None
+
+
+def _row_var_idx(item):
+    """groupby key for answer-option inputs in ctx.inputs_list."""
+    return item["id"]["var_idx"]
+
+
 @callback(
     Output("store-variables", "data"),
     Output("global-select-all", "value"),
@@ -1038,73 +1474,204 @@ def create_app(spss_path, meta_path=None):
     Input({"type": "var-label", "index": ALL}, "value"),
     Input({"type": "sub-label", "var_idx": ALL, "sub_idx": ALL}, "value"),
     Input({"type": "val-label", "var_idx": ALL, "val_code": ALL}, "value"),
-    State({"type": "var-meta", "index": ALL}, "data"),
     State("store-variables", "data"),
     prevent_initial_call=True,
 )
-def sync_variable_store(include_vals, label_vals, sub_label_vals, val_label_vals, meta_vals, current):
+def sync_variable_store(include_vals, label_vals, sub_label_vals, val_label_vals, current):
     """Keep store-variables in sync with all UI edits."""
     if not current:
         return no_update, no_update
 
-    updated = list(current)
+    # A single edited field (the usual case) is sent as a Patch; bulk
+    # changes such as select-all or newly mounted cards take the full merge.
+    if len(ctx.triggered) == 1 and isinstance(ctx.triggered_id, dict):
+        single = _patch_single_edit(ctx.triggered_id, ctx.triggered[0].get("value"), current)
+        if single is not None:
+            return single
+
+    # Otherwise compare every mounted input with the store and patch only
+    # the fields that differ.
+    n = len(current)
+    patch = Patch()
+    changed = False
+    include_changes = {}
 
     # ── individual checkbox / label edits ────────────────────────────
-    for i, (inc, lbl, meta) in enumerate(zip(include_vals, label_vals, meta_vals)):
-        if i < len(updated):
-            updated[i]["included"] = bool(inc)  # [] or ["included"]
-            if lbl:
-                updated[i]["label"] = lbl
+    # Only mounted cards report values, so map them back by component id.
+    for inc_item, lbl_item in zip(ctx.inputs_list[0], ctx.inputs_list[1]):
+        i = inc_item["id"]["index"]
+        if i >= n:
+            continue
+        var = current[i]
+        inc = bool(inc_item.get("value"))  # [] or ["included"]
+        if inc != var.get("included", True):
+            patch[i]["included"] = include_changes[i] = inc
+            changed = True
+        lbl = lbl_item.get("value")
+        if lbl and lbl != var.get("label"):
+            patch[i]["label"] = lbl
+            changed = True
+
+    # Option rows arrive in layout order, i.e. grouped by card, so each
+    # variable's label dict is looked up once per group.
 
     # ── multi-punch sub-variable labels ──────────────────────────────
-    for item in ctx.inputs_list[2]:
-        v_idx = item["id"]["var_idx"]
-        s_idx = item["id"]["sub_idx"]
-        new_lbl = item.get("value")
-        if new_lbl is None:
+    for v_idx, items in groupby(ctx.inputs_list[2], key=_row_var_idx):
+        if v_idx >= n:
             continue
-        if v_idx < len(updated):
-            sv_list = updated[v_idx].get("sub_variables", [])
-            if s_idx < len(sv_list):
-                sv_key = sv_list[s_idx]
-                updated[v_idx]["sub_variable_labels"][sv_key] = new_lbl
+        sv_list = current[v_idx].get("sub_variables", [])
+        sv_labels = current[v_idx].get("sub_variable_labels")
+        if sv_labels is None:
+            patch[v_idx]["sub_variable_labels"] = sv_labels = {}
+        for item in items:
+            new_lbl = item.get("value")
+            s_idx = item["id"]["sub_idx"]
+            if new_lbl is None or s_idx >= len(sv_list):
+                continue
+            sv_key = sv_list[s_idx]
+            if sv_labels.get(sv_key) != new_lbl:
+                patch[v_idx]["sub_variable_labels"][sv_key] = new_lbl
+                changed = True
 
     # ── single-punch value labels ─────────────────────────────────────
-    for item in ctx.inputs_list[3]:
-        v_idx = item["id"]["var_idx"]
-        val_code = item["id"]["val_code"]
-        new_lbl = item.get("value")
-        if new_lbl is None:
+    for v_idx, items in groupby(ctx.inputs_list[3], key=_row_var_idx):
+        if v_idx >= n:
             continue
-        if v_idx < len(updated):
-            if "value_labels" not in updated[v_idx]:
-                updated[v_idx]["value_labels"] = {}
-            updated[v_idx]["value_labels"][val_code] = new_lbl
-
-    # ── mirror global checkbox: all=checked, none=unchecked, mixed=leave ──
-    all_included = all(v.get("included", True) for v in updated)
-    none_included = not any(v.get("included", True) for v in updated)
-    if all_included:
-        new_global = ["all"]
-    elif none_included:
-        new_global = []
-    else:
-        new_global = no_update
+        val_labels = current[v_idx].get("value_labels")
+        if val_labels is None:
+            patch[v_idx]["value_labels"] = val_labels = {}
+        for item in items:
+            new_lbl = item.get("value")
+            val_code = item["id"]["val_code"]
+            if new_lbl is not None and val_labels.get(val_code) != new_lbl:
+                patch[v_idx]["value_labels"][val_code] = new_lbl
+                changed = True
+
+    # ── mirror global checkbox ────────────────────────────────────────
+    new_global = _global_select_value(
+        include_changes.get(i, v.get("included", True))
+        for i, v in enumerate(current)
+    )
 
-    return updated, new_global
+    return (patch if changed else no_update), new_global
 
 @callback(
     Output({"type": "var-include", "index": ALL}, "value"),
+    Output("store-variables", "data", allow_duplicate=True),
     Input("global-select-all", "value"),
     State("store-variables", "data"),
     prevent_initial_call=True,
 )
 def apply_global_select(global_sel, current):
-    """Push global select/deselect into every individual checkbox."""
+    """Push global select/deselect into every individual checkbox.
+
+    Cards that are not mounted yet have no checkbox, so the store is
+    updated directly as well.
+    """
     if not current:
+        return no_update, no_update
+    included = bool(global_sel)
+    target = ["included"] if included else []
+    updated = list(current)
+    for v in updated:
+        v["included"] = included
+    return [target] * len(ctx.outputs_list[0]), updated
+
+@callback(
+    Output("variable-list", "children"),
+    Output("store-rendered-cards", "data"),
+    Output("variable-list-more", "children"),
+    Output("variable-list-more", "style"),
+    Input("variable-list-more", "n_clicks"),
+    State("store-rendered-cards", "data"),
+    State("store-variables", "data"),
+    prevent_initial_call=True,
+)
+def mount_more_variables(n_clicks, rendered, current):
+    """Append the next batch of variable cards, built from the current store."""
+    current = current or []
+    rendered = rendered or 0
+    if not n_clicks or rendered >= len(current):
+        return no_update, no_update, no_update, no_update
+    end = min(rendered + _CARD_BATCH, len(current))
+    patch = Patch()
+    patch.extend([make_variable_card(current[i], i) for i in range(rendered, end)])
+    label, style = _more_button_props(end, len(current))
+    return patch, end, label, style
+
+@callback(
+    Output({"type": "var-collapse", "index": MATCH}, "is_open"),
+    Output({"type": "var-collapse", "index": MATCH}, "children"),
+    Output({"type": "var-toggle", "index": MATCH}, "children"),
+    Input({"type": "var-toggle", "index": MATCH}, "n_clicks"),
+    State({"type": "var-collapse", "index": MATCH}, "is_open"),
+    State({"type": "var-collapse", "index": MATCH}, "children"),
+    State("store-spss-file", "data"),
+    State("store-meta-file", "data"),
+    prevent_initial_call=True,
+)
+def toggle_answer_options(n_clicks, is_open, rows, spss_path, meta_path):
+    """Expand/collapse a card's answer options, building the rows on first open."""
+    idx = ctx.triggered_id["index"]
+    if not n_clicks or not spss_path:
+        return no_update, no_update, no_update
+    try:
+        variables = _initial_variables(spss_path, meta_path)
+    except OSError:
+        return no_update, no_update, no_update
+    if idx >= len(variables):
+        return no_update, no_update, no_update
+
+    var = variables[idx]
+    opening = not is_open
+    # Answer options can only be edited in these rows, so until they exist
+    # they match the file; once built they stay mounted and keep their values.
+    new_rows = _make_answer_option_rows(var, idx) if opening and not rows else no_update
+    return opening, new_rows, _options_toggle_label(var, opening)
+
+
+# Debounce dropdown typing in the browser: only the value that is still
+# current 150 ms after the last keystroke is forwarded to the server.
+# The renderer awaits the returned Promise (dash>=2.4.0, see requirements.txt).
+clientside_callback(
+    """
+    function(search) {
+        const seq = (window._cbVarSearchSeq || 0) + 1;
+        window._cbVarSearchSeq = seq;
+        return new Promise(function(resolve) {
+            setTimeout(function() {
+                resolve(seq === window._cbVarSearchSeq
+                        ? search : window.dash_clientside.no_update);
+            }, 150);
+        });
+    }
+    """,
+    Output("store-filter-var-search", "data"),
+    Input("new-filter-var", "search_value"),
+    prevent_initial_call=True,
+)
+
+
+@callback(
+    Output("new-filter-var", "options"),
+    Input("store-filter-var-search", "data"),
+    State("new-filter-var", "value"),
+    State("store-spss-file", "data"),
+    prevent_initial_call=True,
+)
+def search_filter_vars(search, selected, spss_path):
+    """Serve the filter variable dropdown's options from the server as the user types."""
+    if not spss_path:
         return no_update
-    target = ["included"] if bool(global_sel) else []
-    return [target] * len(current)
+    options = _var_options(spss_path)
+    needle = (search or "").strip().lower()
+    matches = (o for o, lbl in options if needle in lbl)
+    result = list(islice(matches, _VAR_OPTION_LIMIT))
+    # Keep the current selection resolvable so its label still shows
+    if selected and all(o["value"] != selected for o in result):
+        result += [o for o, _ in options if o["value"] == selected]
+    return result
+
 
 @callback(
     Output("weight-variable", "disabled"),
@@ -1129,38 +1696,43 @@ def toggle_weight_var(enabled_val):
     State("new-filter-op", "value"),
     State("new-filter-value", "value"),
     State("store-filters", "data"),
-    State({"type": "filter-meta", "index": ALL}, "data"),
+    State("store-spss-file", "data"),
+    State({"type": "filter-row", "index": ALL}, "id"),
     prevent_initial_call=True,
 )
 def manage_filters(
     add_clicks, remove_clicks,
     fname, fvar, fop, fval,
-    current_filters, filter_metas,
+    current_filters, spss_path, row_ids,
 ):
     triggered = ctx.triggered_id
+    # Pattern-matching ids arrive as dicts, the add button as a plain string
+    trigger = triggered.get("type") if isinstance(triggered, dict) else triggered
 
-    def _filter_options(filters):
-        return [{"label": n, "value": n} for n in (filters or {}).keys()]
+    # Each change is sent as a Patch at the filter's position rather than
+    # re-sending every filter. The filter cards and the global-filter options
+    # are built and appended in the same order, so the rendered rows give the
+    # position in both. The store-filters dict cannot: the browser moves
+    # integer-like keys such as "2024" to the front.
+    rows = [r["index"] for r in row_ids or ()]
 
     # ── Remove a filter ──────────────────────────────────────────────────
-    if isinstance(triggered, dict) and triggered.get("type") == "remove-filter":
-        rm_idx = triggered["index"]
-        new_filters = {}
-        for i, meta in enumerate(filter_metas):
-            if i != rm_idx:
-                new_filters[meta["name"]] = meta["conditions"]
-        cards = [
-            make_filter_card(n, c, i)
-            for i, (n, c) in enumerate(new_filters.items())
-        ]
-        return new_filters, cards, "", no_update, no_update, _filter_options(new_filters)
+    if trigger == "remove-filter":
+        rm_name = triggered["index"]
+        if (not ctx.triggered[0]["value"] or rm_name not in (current_filters or {})
+                or rm_name not in rows):
+            return no_update, no_update, no_update, no_update, no_update, no_update
+        filters, cards, options = _remove_filter_patches(rm_name, rows)
+        return filters, cards, "", no_update, no_update, options
 
     # ── Add a filter ─────────────────────────────────────────────────────
-    if triggered == "add-filter-btn":
+    if trigger == "add-filter-btn":
         if not fname or not fname.strip():
             return no_update, no_update, "⚠ Filter name is required.", no_update, no_update, no_update
         if not fvar:
             return no_update, no_update, "⚠ Please select a variable.", no_update, no_update, no_update
+        if spss_path and fvar not in _column_set(spss_path):
+            return no_update, no_update, f"⚠ Unknown variable '{fvar}'.", no_update, no_update, no_update
         if not fop:
             return no_update, no_update, "⚠ Please select an operator.", no_update, no_update, no_update
 
@@ -1171,16 +1743,42 @@ def manage_filters(
         except ValueError as e:
             return no_update, no_update, f"⚠ {e}", no_update, no_update, no_update
 
-        new_filters = dict(current_filters or {})
-        new_filters[fname] = {fvar: condition}
-        cards = [
-            make_filter_card(n, c, i)
-            for i, (n, c) in enumerate(new_filters.items())
-        ]
-        return new_filters, cards, "", "", "", _filter_options(new_filters)
+        conditions = {fvar: condition}
+        card = make_filter_card(fname, conditions)
+        if current_filters is None:
+            return ({fname: conditions}, [card], "", "", "",
+                    [{"label": fname, "value": fname}])
+
+        filters, cards, options = _put_filter_patches(fname, conditions, card, rows)
+        return filters, cards, "", "", "", options
 
     return no_update, no_update, "", no_update, no_update, no_update
 
+
+def _remove_filter_patches(name, rows):
+    """Patches for store-filters, the filter cards and the global-filter
+    options that remove filter name, found by its position in rows."""
+    pos = rows.index(name)
+    filters, cards, options = Patch(), Patch(), Patch()
+    del filters[name]
+    del cards[pos]
+    del options[pos]
+    return filters, cards, options
+
+
+def _put_filter_patches(name, conditions, card, rows):
+    """Patches for store-filters, the filter cards and the global-filter
+    options that add filter name, or redefine it in place if it is in rows."""
+    filters, cards = Patch(), Patch()
+    filters[name] = conditions
+    if name in rows:
+        cards[rows.index(name)] = card
+        return filters, cards, no_update
+    cards.append(card)
+    options = Patch()
+    options.append({"label": name, "value": name})
+    return filters, cards, options
+
 @callback(
     Output("store-save-path", "data"),
     Input("save-path-input", "value"),
@@ -1189,9 +1787,53 @@ def manage_filters(
 def update_save_path(path):
     return path or default_save_path
 
+# ── background save ──
+# Disk writes run on a single worker so the save callback returns at once;
+# the save-poll interval picks the result up when the write finishes.
+_save_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="config-save")
+_save_jobs = {}  # job id → (future, save_path, variable count, weighting note)
+_save_job_ids = count(1)
+_save_jobs_lock = threading.Lock()
+# A job is normally collected by poll_save. Double clicks or leaving the page
+# before the poll fires orphan it, so only this many finished jobs are kept.
+_SAVE_JOBS_LIMIT = 16
+
+
+def _submit_save(save_path, config, n_vars, w_note):
+    """Queue config to be written to save_path; return the job id for poll_save."""
+    job = next(_save_job_ids)
+    future = _save_pool.submit(_write_config, save_path, config)
+    with _save_jobs_lock:
+        _save_jobs[job] = (future, save_path, n_vars, w_note)
+        # Jobs finish in submission order, so the oldest entries go first
+        while len(_save_jobs) > _SAVE_JOBS_LIMIT:
+            oldest = next(iter(_save_jobs))
+            if not _save_jobs[oldest][0].done():
+                break
+            del _save_jobs[oldest]
+    return job
+
+
+def _write_config(save_path, config):
+    payload = _json_dumps_file(config)
+    try:
+        f = open(save_path, "wb")
+    except FileNotFoundError:
+        # Create the folder only on the first save into it
+        save_dir = os.path.dirname(save_path)
+        if not save_dir:
+            raise
+        os.makedirs(save_dir, exist_ok=True)
+        f = open(save_path, "wb")
+    with f:
+        f.write(payload)
+
+
 @callback(
     Output("save-status", "children"),
     Output("save-status", "style"),
+    Output("store-save-job", "data"),
+    Output("save-poll", "disabled"),
     Input("save-btn", "n_clicks"),
     State("store-variables", "data"),
     State("store-filters", "data"),
@@ -1205,7 +1847,7 @@ def update_save_path(path):
 def save_config(n_clicks, variables, filters, save_path,
                 weight_enabled, weight_var, global_filter, passthrough):
     if not n_clicks:
-        return "", {}
+        return "", {}, no_update, no_update
 
     included = [v for v in (variables or []) if v.get("included", True)]
 
@@ -1213,6 +1855,8 @@ def save_config(n_clicks, variables, filters, save_path,
         return (
             "⚠ No variables selected — nothing to save.",
             {"color": "#EF4444", "fontSize": "13px", "textAlign": "center", "marginTop": "10px"},
+            no_update,
+            no_update,
         )
 
     # Build JSON structure
@@ -1247,6 +1891,8 @@ def save_config(n_clicks, variables, filters, save_path,
         return (
             "⚠ Weighting is enabled but no weight variable is selected.",
             {"color": "#F59E0B", "fontSize": "13px", "textAlign": "center", "marginTop": "10px"},
+            no_update,
+            no_update,
         )
     else:
         config["weighting"] = {"enabled": False}
@@ -1257,24 +1903,47 @@ def save_config(n_clicks, variables, filters, save_path,
     if "output_file" in pt and pt["output_file"]:
         config["output_file"] = pt["output_file"]
 
-    # Ensure directory exists
-    save_dir = os.path.dirname(save_path)
-    if save_dir:
-        os.makedirs(save_dir, exist_ok=True)
+    w_note = f" | Weighted: {weight_var}" if (w_on and weight_var) else " | Unweighted"
+    job = _submit_save(save_path, config, len(config_vars), w_note)
+    return (
+        "⏳ Saving…",
+        {"color": "#64748B", "fontSize": "12px", "textAlign": "center", "marginTop": "10px"},
+        job,
+        False,
+    )
+
+
+@callback(
+    Output("save-status", "children", allow_duplicate=True),
+    Output("save-status", "style", allow_duplicate=True),
+    Output("save-poll", "disabled", allow_duplicate=True),
+    Input("save-poll", "n_intervals"),
+    State("store-save-job", "data"),
+    prevent_initial_call=True,
+)
+def poll_save(_n, job):
+    entry = _save_jobs.get(job)
+    if entry is None:
+        return no_update, no_update, True
+    future, save_path, n_vars, w_note = entry
+    if not future.done():
+        return no_update, no_update, no_update
+    with _save_jobs_lock:
+        _save_jobs.pop(job, None)
 
     try:
-        with open(save_path, "w", encoding="utf-8") as f:
-            json.dump(config, f, indent=2, ensure_ascii=False)
+        future.result()
         ts = datetime.now().strftime("%H:%M:%S")
-        w_note = f" | Weighted: {weight_var}" if (w_on and weight_var) else " | Unweighted"
         return (
-            f"✅ Saved {len(config_vars)} variable(s) to {os.path.basename(save_path)} at {ts}.{w_note}",
+            f"✅ Saved {n_vars} variable(s) to {os.path.basename(save_path)} at {ts}.{w_note}",
             {"color": "#059669", "fontSize": "12px", "textAlign": "center", "marginTop": "10px"},
+            True,
         )
     except Exception as e:
         return (
             f"❌ Save failed: {e}",
             {"color": "#EF4444", "fontSize": "13px", "textAlign": "center", "marginTop": "10px"},
+            True,
         )
 
 
@@ -1284,6 +1953,63 @@ def save_config(n_clicks, variables, filters, save_path,
 # Filter value parser
 # ─────────────────────────────────────────────
 
+_FLOAT_RE = re.compile(r'[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?\Z')
+_FLOAT_WORDS = frozenset(("inf", "infinity", "nan"))
+# Digits with single "_" separators, as int()/float() accept them
+_DIGIT_PART = r'\d(?:_?\d)*'
+_GROUPED_INT_RE = re.compile(rf'[+-]?{_DIGIT_PART}\Z')
+_GROUPED_FLOAT_RE = re.compile(
+    rf'[+-]?(?:{_DIGIT_PART}(?:\.(?:{_DIGIT_PART})?)?|\.{_DIGIT_PART})'
+    rf'(?:[eE][+-]?{_DIGIT_PART})?\Z'
+)
+
+
+def _coerce_number(token):
+    """Return token as int or float when it looks numeric, else unchanged."""
+    digits = token[1:] if token[:1] in ("+", "-") else token
+    if digits.isdecimal():
+        return int(token)
+    if _FLOAT_RE.match(token):
+        return float(token)
+    # Other spellings int()/float() accept ("1_000", "inf", "nan"), matched
+    # up front so labels never raise and catch a ValueError
+    if digits.lower() in _FLOAT_WORDS:
+        return float(token)
+    if "_" in token:
+        if _GROUPED_INT_RE.match(token):
+            return int(token)
+        if _GROUPED_FLOAT_RE.match(token):
+            return float(token)
+    return token
+
+
+def _parse_in(raw):
+    result = [_coerce_number(p) for p in map(str.strip, raw.split(",")) if p]
+    if not result:
+        raise ValueError("'in' requires at least one value.")
+    return result
+
+
+def _parse_between(raw):
+    parts = [p for p in map(str.strip, raw.split(",")) if p]
+    if len(parts) != 2:
+        raise ValueError("'between' requires exactly two comma-separated values.")
+    result = []
+    for p in parts:
+        val = _coerce_number(p)
+        # float() raises the usual ValueError for non-numeric bounds
+        result.append(float(p) if isinstance(val, str) else val)
+    return result
+
+
+# operator → parser for the stripped raw text; other operators keep the text
+_FILTER_VALUE_PARSERS = {
+    "eq": _coerce_number,
+    "in": _parse_in,
+    "between": _parse_between,
+}
+
+
 def _parse_filter_value(operator, raw):
     """Convert raw text input into the operator dict the filter_engine expects.
     e.g. eq + "1"  →  {"eq": 1}
@@ -1296,45 +2022,8 @@ def _parse_filter_value(operator, raw):
         raise ValueError(f"A value is required for operator '{operator}'.")
 
     raw = raw.strip()
-
-    if operator == "eq":
-        try:
-            val = int(raw)
-        except ValueError:
-            try:
-                val = float(raw)
-            except ValueError:
-                val = raw
-        return {"eq": val}
-
-    if operator == "in":
-        parts = [p.strip() for p in raw.split(",") if p.strip()]
-        result = []
-        for p in parts:
-            try:
-                result.append(int(p))
-            except ValueError:
-                try:
-                    result.append(float(p))
-                except ValueError:
-                    result.append(p)
-        if not result:
-            raise ValueError("'in' requires at least one value.")
-        return {"in": result}
-
-    if operator == "between":
-        parts = [p.strip() for p in raw.split(",") if p.strip()]
-        if len(parts) != 2:
-            raise ValueError("'between' requires exactly two comma-separated values.")
-        result = []
-        for p in parts:
-            try:
-                result.append(int(p))
-            except ValueError:
-                result.append(float(p))
-        return {"between": result}
-
-    return {operator: raw}
+    parser = _FILTER_VALUE_PARSERS.get(operator)
+    return {operator: parser(raw) if parser is not None else raw}
 
 
 # ─────────────────────────────────────────────
@@ -1344,3 +2033,46 @@ def _parse_filter_value(operator, raw):
 # config_builder.py is now a module used by pages/config.py.
 # create_app(spss_path, meta_path) returns a layout (html.Div).
 # Callbacks are module-level and register on the shared Dash app at import time.
+
+
+# Test function
+if __name__ == "__main__":
+    def _ops(patch):
+        return [(op["operation"], op["location"])
+                for op in patch.to_plotly_json()["operations"]]
+
+    # The browser lists integer-like keys first, so store-filters arrives
+    # as {"2024": ..., "Adults": ...} while the rows read Adults, 2024.
+    rows = ["Adults", "2024"]
+
+    filters, cards, options = _remove_filter_patches("2024", rows)
+    assert _ops(filters) == [("Delete", ["2024"])], _ops(filters)
+    assert _ops(cards) == _ops(options) == [("Delete", [1])], _ops(options)
+    _, cards, options = _remove_filter_patches("Adults", rows)
+    assert _ops(cards) == _ops(options) == [("Delete", [0])], _ops(options)
+
+    card = make_filter_card("2024", {"Year": {"eq": 2025}})
+    _, cards, options = _put_filter_patches("2024", {"Year": {"eq": 2025}}, card, rows)
+    assert _ops(cards) == [("Assign", [1])] and options is no_update, _ops(cards)
+    print("✓ Filter rows and global-filter options are patched at their rendered position")
+
+    # Filter values parse the same way int()/float() read them
+    assert _parse_filter_value("eq", "1_000") == {"eq": 1000}
+    assert _parse_filter_value("in", "1, 2.5, inf, Male") == {"in": [1, 2.5, float("inf"), "Male"]}
+    assert _parse_filter_value("between", "-1e3, 2") == {"between": [-1000.0, 2]}
+    nan = _parse_filter_value("eq", "nan")["eq"]
+    assert isinstance(nan, float) and nan != nan
+    print("✓ Filter values are coerced like int()/float()")
+
+    # Save jobs whose poll never runs are dropped once the cap is reached
+    with tempfile.TemporaryDirectory() as save_dir:
+        def _save(name):
+            return _submit_save(os.path.join(save_dir, name), {"variables": []}, 0, "")
+
+        jobs = [_save(f"{i}.json") for i in range(_SAVE_JOBS_LIMIT + 5)]
+        _save_pool.submit(lambda: None).result()
+        last = _save("last.json")
+        _save_jobs[last][0].result()
+        assert len(_save_jobs) == _SAVE_JOBS_LIMIT, len(_save_jobs)
+        assert jobs[0] not in _save_jobs
+    print("✓ Orphaned save jobs are capped")
@@ -1,7 +1,43 @@
+import functools
 import json
 import os
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # optional; stdlib json is the fallback
+    orjson = None
+
+
+def _json_loads(raw):
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # orjson rejects a UTF-8 BOM and NaN/Infinity literals; json accepts both
+            pass
+    return json.loads(raw)
+
+
+@functools.lru_cache(maxsize=128)
+def _derive_output_file(spss_path):
+    """Output path next to the SPSS file: <SPSSNAME>_Frequencies.txt"""
+    spss_dir = os.path.dirname(spss_path)
+    base = os.path.splitext(os.path.basename(spss_path))[0]
+    return os.path.join(spss_dir, f"{base}_Frequencies.txt")
+
+
+# Filter operator → (value check, requirement shown when the check fails)
+_FILTER_OPERATOR_RULES = {
+    'eq': (lambda v: True, ''),
+    'in': (lambda v: isinstance(v, list), 'a list value'),
+    'between': (lambda v: isinstance(v, list) and len(v) == 2, 'a list of 2 values'),
+    'not_missing': (lambda v: v is True, 'value=true'),
+    'any': (lambda v: isinstance(v, list), 'a list of sub-variables'),
+    'all': (lambda v: isinstance(v, list), 'a list of sub-variables'),
+    'min_selected': (lambda v: isinstance(v, int) and v >= 1, 'a positive integer'),
+}
+
 
 class ConfigLoader:
     """Loads and validates the meta.json configuration file"""
@@ -33,8 +69,9 @@ class ConfigLoader:
             raise FileNotFoundError(f"Configuration file not found: {self.config_path}")
         
         try:
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                self.config = json.load(f)
+            with open(self.config_path, 'rb') as f:
+                raw = f.read()
+            self.config = _json_loads(raw)
             
             print(f"✓ Configuration loaded from {self.config_path}")
             return self.config
@@ -73,33 +110,39 @@ class ConfigLoader:
             if not os.path.exists(spss_path):
                 print(f"⚠ Warning: SPSS file not found (will be selected via UI): {spss_path}")
         
-        # Validate variables
+        # Validate variables in one pass, collecting the multi-punch names and
+        # filter_set reference errors (reported after the filter_sets checks)
+        multi_names = None
+        reference_errors = []
         if 'variables' in self.config:
             if not isinstance(self.config['variables'], list):
                 errors.append("'variables' must be a list")
             else:
+                filter_sets = self.config.get('filter_sets')
+                multi_names = set()
                 for i, var in enumerate(self.config['variables']):
                     var_errors = self._validate_variable(var, i)
                     errors.extend(var_errors)
+                    if var.get('type') == 'multi':
+                        multi_names.add(var.get('name'))
+                    # Validate filter_set references in variables
+                    if filter_sets is not None and 'filter_set' in var:
+                        filter_set_name = var['filter_set']
+                        if filter_set_name not in filter_sets:
+                            reference_errors.append(
+                                f"Variable {i+1} ({var.get('name', 'unnamed')}): "
+                                f"filter_set '{filter_set_name}' not found in filter_sets"
+                            )
         
         # Validate filter_sets (if present)
         if 'filter_sets' in self.config:
-            filter_errors = self._validate_filter_sets()
+            filter_errors = self._validate_filter_sets(multi_names)
             errors.extend(filter_errors)
         
         # Note: global_filter, output_format, and visualization are now app-level settings
         # selected via UI - they are no longer required in the JSON configuration
         
-        # Validate filter_set references in variables
-        if 'variables' in self.config and 'filter_sets' in self.config:
-            for i, var in enumerate(self.config['variables']):
-                if 'filter_set' in var:
-                    filter_set_name = var['filter_set']
-                    if filter_set_name not in self.config['filter_sets']:
-                        errors.append(
-                            f"Variable {i+1} ({var.get('name', 'unnamed')}): "
-                            f"filter_set '{filter_set_name}' not found in filter_sets"
-                        )
+        errors.extend(reference_errors)
 
         # Validate weighting (if present)
         if 'weighting' in self.config:
@@ -108,10 +151,7 @@ class ConfigLoader:
         
         # Derive output_file name from SPSS filename when SPSS path is provided
         if spss_path_to_use:
-            spss_dir = os.path.dirname(spss_path_to_use)
-            base = os.path.splitext(os.path.basename(spss_path_to_use))[0]
-            # Use capitalized pattern as requested: <SPSSNAME>_Frequencies.txt
-            self.config['output_file'] = os.path.join(spss_dir, f"{base}_Frequencies.txt")
+            self.config['output_file'] = _derive_output_file(spss_path_to_use)
             print(f"✓ Set output_file to {self.config['output_file']} (derived from SPSS file name)")
         else:
             # No SPSS path available — keep existing output_file or set a sensible default
@@ -164,10 +204,14 @@ class ConfigLoader:
         
         return errors
     
-    def _validate_filter_sets(self):
+    def _validate_filter_sets(self, multi_names=None):
         """
         Validate filter_sets configuration
         
+        Args:
+            multi_names: Optional set of multi-punch variable names
+                (collected from the config when omitted)
+        
         Returns:
             list: List of error messages
         """
@@ -178,6 +222,10 @@ class ConfigLoader:
             errors.append("'filter_sets' must be a dictionary")
             return errors
         
+        # Multi-punch names for the min_selected check, collected once
+        if multi_names is None:
+            multi_names = self._multi_variable_names()
+        
         # Validate each filter set
         for filter_name, filter_conditions in filter_sets.items():
             if not isinstance(filter_conditions, dict):
@@ -187,13 +235,20 @@ class ConfigLoader:
             # Validate each condition in the filter set
             for var_name, condition in filter_conditions.items():
                 condition_errors = self._validate_filter_condition(
-                    filter_name, var_name, condition
+                    filter_name, var_name, condition, multi_names
                 )
                 errors.extend(condition_errors)
         
         return errors
     
-    def _validate_filter_condition(self, filter_name, var_name, condition):
+    def _multi_variable_names(self):
+        """Names of variables defined as type='multi', or None without a variables list"""
+        variables = self.config.get('variables')
+        if not isinstance(variables, list):
+            return None
+        return {v.get('name') for v in variables if v.get('type') == 'multi'}
+    
+    def _validate_filter_condition(self, filter_name, var_name, condition, multi_names=None):
         """
         Validate a single filter condition
         
@@ -201,6 +256,8 @@ class ConfigLoader:
             filter_name: Name of the filter set
             var_name: Variable name
             condition: Condition dict (e.g., {"eq": 1})
+            multi_names: Optional set of multi-punch variable names
+                (computed from the config when omitted)
         
         Returns:
             list: List of error messages
@@ -223,69 +280,36 @@ class ConfigLoader:
             )
             return errors
         
-        operator = list(condition.keys())[0]
-        value = condition[operator]
+        operator, value = next(iter(condition.items()))
         
         # Validate operator
-        valid_operators = ['eq', 'in', 'between', 'not_missing', 'any', 'all', 'min_selected']
-        if operator not in valid_operators:
+        rule = _FILTER_OPERATOR_RULES.get(operator)
+        if rule is None:
             errors.append(
                 f"Filter '{filter_name}', variable '{var_name}': "
-                f"unknown operator '{operator}'. Valid operators: {valid_operators}"
+                f"unknown operator '{operator}'. Valid operators: {list(_FILTER_OPERATOR_RULES)}"
             )
             return errors
         
-        # Validate value based on operator
-        if operator == 'in':
-            if not isinstance(value, list):
-                errors.append(
-                    f"Filter '{filter_name}', variable '{var_name}': "
-                    f"operator 'in' requires a list value"
-                )
-        
-        elif operator == 'between':
-            if not isinstance(value, list) or len(value) != 2:
-                errors.append(
-                    f"Filter '{filter_name}', variable '{var_name}': "
-                    f"operator 'between' requires a list of 2 values"
-                )
-        
-        elif operator == 'not_missing':
-            if value is not True:
-                errors.append(
-                    f"Filter '{filter_name}', variable '{var_name}': "
-                    f"operator 'not_missing' requires value=true"
-                )
-        
-        elif operator in ['any', 'all']:
-            if not isinstance(value, list):
-                errors.append(
-                    f"Filter '{filter_name}', variable '{var_name}': "
-                    f"operator '{operator}' requires a list of sub-variables"
-                )
+        # Validate value based on operator; messages are only formatted on failure
+        check, requirement = rule
+        if not check(value):
+            errors.append(
+                f"Filter '{filter_name}', variable '{var_name}': "
+                f"operator '{operator}' requires {requirement}"
+            )
         
-        elif operator == 'min_selected':
-            if not isinstance(value, int) or value < 1:
+        if operator == 'min_selected':
+            # Check if variable is defined as multi-punch
+            # We'll do a deeper check during processing, but warn if suspicious
+            if multi_names is None:
+                multi_names = self._multi_variable_names()
+            if multi_names is not None and var_name not in multi_names:
                 errors.append(
                     f"Filter '{filter_name}', variable '{var_name}': "
-                    f"operator 'min_selected' requires a positive integer"
+                    f"operator 'min_selected' used but variable not defined as type='multi' "
+                    f"in variables list. This will cause a runtime error."
                 )
-            
-            # Check if variable is defined as multi-punch
-            # We'll do a deeper check during processing, but warn if suspicious
-            if 'variables' in self.config:
-                var_found = False
-                for v in self.config['variables']:
-                    if v.get('name') == var_name and v.get('type') == 'multi':
-                        var_found = True
-                        break
-                
-                if not var_found:
-                    errors.append(
-                        f"Filter '{filter_name}', variable '{var_name}': "
-                        f"operator 'min_selected' used but variable not defined as type='multi' "
-                        f"in variables list. This will cause a runtime error."
-                    )
         
         return errors
     
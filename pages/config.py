@@ -6,7 +6,6 @@ config_builder.py is imported at startup so its module-level @callback
 decorators register against the shared Dash app automatically.
 create_app() returns just the layout (html.Div), not a Dash instance.
 """
-import os
 import dash
 from dash import html, dcc, Input, Output, State, callback, no_update
 
@@ -31,31 +30,42 @@ def render_config(pathname, spss_path, meta_path):
     if pathname != "/config":
         return no_update
 
-    if not spss_path or not os.path.exists(spss_path):
-        return html.Div([
-            html.Div([
-                html.H2("No SPSS file loaded", style={"color": "#64748B"}),
-                html.P("Please go to Home and select an SPSS file first."),
-                dcc.Link(
-                    html.Button("Back to Home", className="btn-secondary"),
-                    href="/",
-                ),
-            ], className="home-card",
-               style={"textAlign": "center", "padding": "48px"}),
-        ], className="home-container")
+    if not spss_path:
+        return _no_spss_loaded()
 
     try:
         return _cb.create_app(spss_path, meta_path or None)
     except Exception as e:
+        # create_app stats the .sav first, so a missing file surfaces here
+        if isinstance(e, FileNotFoundError) and e.filename == spss_path:
+            return _no_spss_loaded()
         import traceback
         traceback.print_exc()
-        return html.Div([
-            html.Div([
-                html.H2("Config Builder Error", style={"color": "#EF4444"}),
-                html.P(str(e)),
-                dcc.Link(
-                    html.Button("Back to Home", className="btn-secondary"),
-                    href="/",
-                ),
-            ], className="home-card", style={"padding": "48px"}),
-        ], className="home-container")
+        return _builder_error(e)
+
+
+def _no_spss_loaded():
+    return html.Div([
+        html.Div([
+            html.H2("No SPSS file loaded", style={"color": "#64748B"}),
+            html.P("Please go to Home and select an SPSS file first."),
+            dcc.Link(
+                html.Button("Back to Home", className="btn-secondary"),
+                href="/",
+            ),
+        ], className="home-card",
+           style={"textAlign": "center", "padding": "48px"}),
+    ], className="home-container")
+
+
+def _builder_error(e):
+    return html.Div([
+        html.Div([
+            html.H2("Config Builder Error", style={"color": "#EF4444"}),
+            html.P(str(e)),
+            dcc.Link(
+                html.Button("Back to Home", className="btn-secondary"),
+                href="/",
+            ),
+        ], className="home-card", style={"padding": "48px"}),
+    ], className="home-container")
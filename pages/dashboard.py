@@ -5,19 +5,20 @@ Reads spss_path and meta_path from shared session stores.
 """
 import os
 import copy
+import functools
+import threading
 from datetime import datetime
 
 import dash
-from dash import html, dcc, Input, Output, State, callback, no_update, ctx, MATCH, ALL
-import dash_bootstrap_components as dbc
 import pandas as pd
-import plotly.graph_objects as go
+from dash import html, dcc, Input, Output, State, callback, clientside_callback, no_update, ctx, MATCH, ALL, Patch
 
 from config_loader import ConfigLoader
 from spss_reader import SPSSReader
 from frequency_processor import FrequencyProcessor
 from visualizer import ChartVisualizer
 from filter_engine import FilterEngine
+from weight_calculator import WeightCalculator
 
 dash.register_page(__name__, path='/dashboard', title='Dashboard')
 
@@ -43,30 +44,23 @@ def _coerce_value_label_keys(json_value_labels, column_data):
 
 
 def _build_single_freq_table(column_data, value_labels, total):
-    import numpy as np
-    value_counts = column_data.value_counts(dropna=False)
+    # Count once into a plain dict; missing values are counted separately
+    counts = column_data.value_counts().to_dict()
     if value_labels:
-        ordered_values = list(value_labels.keys())
-        labeled_set = set(value_labels.keys())
-        extras = sorted([v for v in value_counts.index
-                         if not pd.isna(v) and v not in labeled_set])
-        ordered_values = ordered_values + extras
+        extras = sorted(v for v in counts if v not in value_labels)
+        ordered_values = list(value_labels) + extras
     else:
-        ordered_values = sorted([v for v in value_counts.index if not pd.isna(v)])
+        ordered_values = sorted(counts)
     freq_table = []
     valid_total = 0
     for value in ordered_values:
-        count = value_counts.get(value, 0)
+        count = counts.get(value, 0)
         label = value_labels.get(value, str(value)) if value_labels else str(value)
         pct   = (count / total) * 100 if total > 0 else 0
         freq_table.append({'value': value, 'label': label, 'count': count,
                            'percentage': pct, 'is_missing': False})
         valid_total += count
-    missing_count = 0
-    for k in value_counts.index:
-        if pd.isna(k):
-            missing_count = value_counts[k]
-            break
+    missing_count = int(column_data.isna().sum())
     if missing_count > 0:
         freq_table.append({'value': None, 'label': 'Missing',
                            'count': missing_count,
@@ -75,8 +69,16 @@ def _build_single_freq_table(column_data, value_labels, total):
     return freq_table, valid_total
 
 
+def _weighting(data, weight_var):
+    """Return (WeightCalculator, valid rows) for weighting data by weight_var."""
+    wc = WeightCalculator(data, weight_var)
+    valid_data, _ = wc.get_valid_data_and_weights()
+    return wc, valid_data
+
+
 def _process_single_variable(reader, data, var_name, var_label,
-                              filter_info, config, json_value_labels=None):
+                              filter_info, config, json_value_labels=None,
+                              weighting=None):
     weighting_config  = config.get('weighting', {})
     weighting_enabled = weighting_config.get('enabled', False)
     if var_name not in data.columns:
@@ -89,9 +91,8 @@ def _process_single_variable(reader, data, var_name, var_label,
     total = len(column_data)
     if weighting_enabled:
         try:
-            from weight_calculator import WeightCalculator
-            wc = WeightCalculator(data, weighting_config['weight_variable'])
-            valid_data, _ = wc.get_valid_data_and_weights()
+            wc, valid_data = (weighting() if weighting is not None
+                              else _weighting(data, weighting_config['weight_variable']))
             wr = wc.calculate_weighted_frequencies_single(valid_data[var_name], value_labels)
             return {'var_name': var_name, 'var_label': var_label, 'type': 'single',
                     'weighted': True, 'total_unweighted': wr['total_unweighted'],
@@ -113,7 +114,8 @@ def _process_single_variable(reader, data, var_name, var_label,
 
 
 def _process_multi_variable(reader, data, var_name, var_label,
-                             sub_variables, filter_info, config, sub_variable_labels=None):
+                             sub_variables, filter_info, config, sub_variable_labels=None,
+                             weighting=None):
     if sub_variable_labels is None:
         sub_variable_labels = {}
     weighting_config  = config.get('weighting', {})
@@ -121,15 +123,16 @@ def _process_multi_variable(reader, data, var_name, var_label,
     existing_vars = [sv for sv in sub_variables if sv in data.columns]
     if not existing_vars:
         return None
-    df   = data[existing_vars].copy()
-    base = int((df == 1).any(axis=1).sum())
+    # One elementwise comparison gives both the base and per-option counts
+    selected = data[existing_vars].to_numpy() == 1
+    base = int(selected.any(axis=1).sum())
     if base == 0:
         return None
+    counts = dict(zip(existing_vars, selected.sum(axis=0).tolist()))
     if weighting_enabled:
         try:
-            from weight_calculator import WeightCalculator
-            wc = WeightCalculator(data, weighting_config['weight_variable'])
-            valid_data, _ = wc.get_valid_data_and_weights()
+            wc, valid_data = (weighting() if weighting is not None
+                              else _weighting(data, weighting_config['weight_variable']))
             sub_data_dict = {sv: valid_data[sv] for sv in existing_vars}
             wr = wc.calculate_weighted_frequencies_multi(sub_data_dict)
             for row in wr['freq_table']:
@@ -148,19 +151,19 @@ def _process_multi_variable(reader, data, var_name, var_label,
             warn = f"⚠ Weighting failed: {e}. Showing unweighted data."
             ft = [{'sub_var': sv,
                    'label': sub_variable_labels.get(sv) or reader.get_variable_label(sv),
-                   'count': int((df[sv] == 1).sum()),
-                   'percentage': (int((df[sv] == 1).sum()) / base * 100) if base > 0 else 0}
+                   'count': counts[sv],
+                   'percentage': (counts[sv] / base * 100) if base > 0 else 0}
                   for sv in existing_vars]
             return {'var_name': var_name, 'var_label': var_label, 'type': 'multi',
-                    'weighted': False, 'base': base, 'total_respondents': len(df),
+                    'weighted': False, 'base': base, 'total_respondents': len(selected),
                     'freq_table': ft, 'filter_info': filter_info, 'weighting_warning': warn}
     ft = [{'sub_var': sv,
            'label': sub_variable_labels.get(sv) or reader.get_variable_label(sv),
-           'count': int((df[sv] == 1).sum()),
-           'percentage': (int((df[sv] == 1).sum()) / base * 100) if base > 0 else 0}
+           'count': counts[sv],
+           'percentage': (counts[sv] / base * 100) if base > 0 else 0}
           for sv in existing_vars]
     return {'var_name': var_name, 'var_label': var_label, 'type': 'multi',
-            'weighted': False, 'base': base, 'total_respondents': len(df),
+            'weighted': False, 'base': base, 'total_respondents': len(selected),
             'freq_table': ft, 'filter_info': filter_info, 'weighting_warning': None}
 
 
@@ -202,7 +205,7 @@ def _create_chart_card(result, fig, var_idx):
 
     result_store = (dcc.Store(id={'type': 'multi-result-store', 'index': var_idx}, data=result)
                     if var_type == 'multi' else None)
-    graph_id = {'type': 'multi-chart', 'index': var_idx} if var_type == 'multi' else f'chart-{var_idx}'
+    graph_id = {'type': f'{var_type}-chart', 'index': var_idx}
     graph = dcc.Graph(figure=fig,
                       config={'displayModeBar': True,
                               'modeBarButtonsToRemove': ['lasso2d', 'select2d'],
@@ -228,17 +231,43 @@ def _create_chart_card(result, fig, var_idx):
 
 
 # ── Data loader (cached per path pair) ────────────────────────────────────
+def _downcast_multi_columns(data, variables_list):
+    """
+    Store multi-punch sub-variables (0/1 indicators, usually float64 from
+    pyreadstat) as int8, or float32 when they hold missing values, so the
+    per-chart "== 1" scans read less memory. Columns that would lose
+    precision are left as they are.
+    """
+    for v in variables_list:
+        if v.get('type') != 'multi':
+            continue
+        for sv in v.get('sub_variables', []):
+            if sv not in data.columns or data[sv].dtype != 'float64':
+                continue
+            col = pd.to_numeric(data[sv], downcast='integer')
+            if col.dtype == 'float64':
+                f32 = col.astype('float32')
+                if not ((f32 == col) | col.isna()).all():
+                    continue
+                col = f32
+            data[sv] = col
+
+
 _cache = {}   # keyed by paths+mtimes; invalidated when JSON changes on disk
 
 
-def _load_data(spss_path, meta_path):
+def _data_key(spss_path, meta_path):
     # Include file mtimes so editing+saving the JSON always re-reads it
     try:
         spss_mtime = os.path.getmtime(spss_path)
         meta_mtime = os.path.getmtime(meta_path)
     except OSError:
         spss_mtime = meta_mtime = 0
-    key = (spss_path, meta_path, spss_mtime, meta_mtime)
+    return (spss_path, meta_path, spss_mtime, meta_mtime)
+
+
+def _load_data(spss_path, meta_path):
+    key = _data_key(spss_path, meta_path)
     if key in _cache:
         return _cache[key]
 
@@ -253,6 +282,7 @@ def _load_data(spss_path, meta_path):
     global_filter = config.get('global_filter', None)
     weighting_cfg = config.get('weighting', {})
     variables_list = config.get('variables', [])
+    _downcast_multi_columns(reader.get_data(), variables_list)
 
     processor = FrequencyProcessor(reader, filter_sets=filter_sets,
                                    global_filter=global_filter,
@@ -262,6 +292,60 @@ def _load_data(spss_path, meta_path):
     return result
 
 
+# ── Filter / frequency caches ─────────────────────────────────────────────
+# All are keyed on the _load_data key first, and only entries for the newest
+# key are kept, so re-saving either file starts fresh and frees the old data.
+# Theme switches and checklist toggles then skip the pandas work for anything
+# already computed. Oldest entries are dropped first.
+# Filtered frames are row subsets of the full data, so the filter and weight
+# caches hold at most a few of them; results are small dicts.
+_FILTER_CACHE_SIZE = 4
+_RESULT_CACHE_SIZE = 2048
+_filter_cache = {}   # (data key, filter name) -> (filtered_data, filter_info)
+_result_cache = {}   # (data key, filter name, var_idx) -> result dict or None
+_weight_cache = {}   # (data key, filter name, weight var) -> (WeightCalculator, valid rows)
+
+
+_cache_lock = threading.Lock()
+
+
+def _cache_put(cache, limit, key, value):
+    with _cache_lock:
+        # Every entry shares one data key after a put, so checking the oldest
+        # is enough to spot entries left from an earlier file version
+        if cache and next(iter(cache))[0] != key[0]:
+            for k in [k for k in cache if k[0] != key[0]]:
+                del cache[k]
+        while len(cache) >= limit:
+            cache.pop(next(iter(cache)), None)
+        cache[key] = value
+
+
+# One visualizer per theme; they hold no per-chart state
+_visualizers = {name: ChartVisualizer(theme=name)
+                for name in ChartVisualizer.COLOR_SCHEMES}
+
+
+def _visualizer(theme_data):
+    theme = (theme_data or {}).get('theme', 'corporate_blue')
+    return _visualizers.get(theme) or _visualizers['corporate_blue']
+
+
+# ── Static sidebar pieces (built once, reused by every render) ────────────
+@functools.lru_cache(maxsize=1)
+def _theme_section():
+    return html.Div([
+        html.H3("🎨 Chart Theme", className="sidebar-section-title"),
+        dcc.Dropdown(id='theme-dropdown',
+                     options=[{'label': '🔵 Corporate Blue', 'value': 'corporate_blue'},
+                              {'label': '💜 Modern',         'value': 'modern'},
+                              {'label': '🏢 Professional',   'value': 'professional'},
+                              {'label': '🌈 Vibrant',        'value': 'vibrant'}],
+                     value='corporate_blue', clearable=False,
+                     className="sidebar-dropdown"),
+    ], className="sidebar-section")
+
+
 # ── Layout (called on every page visit) ───────────────────────────────────
 def layout():
     return html.Div([
@@ -315,8 +399,7 @@ def render_dashboard(pathname, spss_path, meta_path):
     weight_var = config.get('weighting', {}).get('weight_variable', 'N/A') if weighting_enabled else 'N/A'
     spss_name  = os.path.splitext(os.path.basename(spss_path))[0]
 
-    var_options = [{'label': f"{v['label']} ({v['name']})", 'value': i,
-                    'type': v['type'], 'config': v}
+    var_options = [{'label': f"{v['label']} ({v['name']})", 'value': i}
                    for i, v in enumerate(variables_list)]
 
     filter_options = [{'label': 'No Filter (All Data)', 'value': '__none__'}]
@@ -333,6 +416,7 @@ def render_dashboard(pathname, spss_path, meta_path):
         dcc.Store(id='store-config',       data=config),
         dcc.Store(id='store-spss-path-local', data=spss_path),
         dcc.Store(id='store-meta-path-local', data=meta_path),
+        dcc.Store(id='store-rendered-charts', data=[]),   # var_idx of each chart card
 
         # Header
         html.Div([
@@ -346,16 +430,7 @@ def render_dashboard(pathname, spss_path, meta_path):
         html.Div([
             # Sidebar
             html.Div([
-                html.Div([
-                    html.H3("🎨 Chart Theme", className="sidebar-section-title"),
-                    dcc.Dropdown(id='theme-dropdown',
-                                 options=[{'label': '🔵 Corporate Blue', 'value': 'corporate_blue'},
-                                          {'label': '💜 Modern',         'value': 'modern'},
-                                          {'label': '🏢 Professional',   'value': 'professional'},
-                                          {'label': '🌈 Vibrant',        'value': 'vibrant'}],
-                                 value='corporate_blue', clearable=False,
-                                 className="sidebar-dropdown"),
-                ], className="sidebar-section"),
+                _theme_section(),
                 html.Hr(className="sidebar-divider"),
                 html.Div([
                     html.H3("🔍 Filters", className="sidebar-section-title"),
@@ -416,102 +491,218 @@ def render_dashboard(pathname, spss_path, meta_path):
     ], className="dashboard-wrapper")
 
 
-# ── Theme store ────────────────────────────────────────────────────────────
-@callback(
+# ── Theme store (browser-side; nothing to compute) ────────────────────────
+clientside_callback(
+    """
+    function(theme) {
+        return {theme: theme};
+    }
+    """,
     Output('store-theme', 'data'),
     Input('theme-dropdown', 'value'),
     prevent_initial_call=True,
 )
-def update_theme(theme):
-    return {'theme': theme}
+
+
+# ── Cached filter / frequency lookups ─────────────────────────────────────
+def _filtered_data(data_key, reader, filter_name, filter_sets,
+                   variables_list, config):
+    """Return (filtered_data, filter_info) for filter_name (None = all data)."""
+    if not filter_name or filter_name not in filter_sets:
+        return reader.get_data(), None
+    cached = _filter_cache.get((data_key, filter_name))
+    if cached is not None:
+        return cached
+    fe = FilterEngine(reader.get_data(), variables_list or [])
+    try:
+        filtered_data, summary, stats = fe.apply_filter_set(
+            filter_name, filter_sets[filter_name])
+        filter_info = {'name': filter_name, 'summary': summary,
+                       'stats': stats,
+                       'is_global': (filter_name == config.get('global_filter'))}
+    except Exception:
+        filtered_data = reader.get_data()
+        filter_info   = None
+    _cache_put(_filter_cache, _FILTER_CACHE_SIZE,
+               (data_key, filter_name), (filtered_data, filter_info))
+    return filtered_data, filter_info
+
+
+def _variable_result(data_key, reader, filtered, filter_name, var_idx, vc, config):
+    """Frequency result for one configured variable, or None."""
+    result_key = (data_key, filter_name, var_idx)
+    if result_key in _result_cache:
+        return _result_cache[result_key]
+    filtered_data, filter_info = filtered
+    var_name  = vc.get('name')
+    var_label = vc.get('label', var_name)
+
+    def weighting():
+        # Weights are validated once per filtered frame, not per variable
+        weight_var = config.get('weighting', {}).get('weight_variable')
+        weight_key = (data_key, filter_name, weight_var)
+        cached = _weight_cache.get(weight_key)
+        if cached is None:
+            cached = _weighting(filtered_data, weight_var)
+            _cache_put(_weight_cache, _FILTER_CACHE_SIZE, weight_key, cached)
+        return cached
+
+    if vc.get('type') == 'single':
+        result = _process_single_variable(
+            reader, filtered_data, var_name, var_label,
+            filter_info, config,
+            json_value_labels=vc.get('value_labels'),
+            weighting=weighting)
+    else:
+        result = _process_multi_variable(
+            reader, filtered_data, var_name, var_label,
+            vc.get('sub_variables', []), filter_info, config,
+            sub_variable_labels=vc.get('sub_variable_labels', {}),
+            weighting=weighting)
+    _cache_put(_result_cache, _RESULT_CACHE_SIZE, result_key, result)
+    return result
 
 
 # ── Main charts update ─────────────────────────────────────────────────────
 @callback(
     Output('charts-container',  'children'),
     Output('loading-indicator', 'children'),
+    Output('store-rendered-charts', 'data'),
     Input('filter-dropdown',    'value'),
     Input('variable-checklist', 'value'),
-    Input('store-theme',        'data'),
     Input('store-vars-list',    'data'),   # fires when render_dashboard populates it
+    State('store-theme',        'data'),   # theme changes are patched by recolor_charts
     State('store-filter-sets',  'data'),
     State('store-config',       'data'),
     State('store-spss-path-local', 'data'),
     State('store-meta-path-local', 'data'),
+    State('store-rendered-charts', 'data'),
     prevent_initial_call=True,
 )
-def update_charts(selected_filter, selected_vars, theme_data,
-                  variables_list, filter_sets, config,
-                  spss_path, meta_path):
+def update_charts(selected_filter, selected_vars, variables_list, theme_data,
+                  filter_sets, config, spss_path, meta_path, rendered):
     # variables_list now comes as Input (triggers re-run when stores populate)
     if not selected_vars or not spss_path or not meta_path:
         return [html.Div(html.P("⚠️ No variables selected.",
                                 className="no-data-message"),
-                         className="no-data-container")], ""
+                         className="no-data-container")], "", []
 
     try:
         _, reader, _, _, _, _ = _load_data(spss_path, meta_path)
     except Exception as e:
-        return [html.Div(html.P(f"Error: {e}"), className="no-data-container")], ""
+        return [html.Div(html.P(f"Error: {e}"), className="no-data-container")], "", []
+    data_key = _data_key(spss_path, meta_path)
 
-    theme = (theme_data or {}).get('theme', 'corporate_blue')
-    viz   = ChartVisualizer(theme=theme)
+    viz   = _visualizer(theme_data)
     filter_name = selected_filter if selected_filter != '__none__' else None
-    filter_sets = filter_sets or {}
+    config = config or {}
+    filtered = _filtered_data(data_key, reader, filter_name, filter_sets or {},
+                              variables_list, config)
 
-    if filter_name and filter_name in filter_sets:
-        fe = FilterEngine(reader.get_data(), variables_list or [])
-        try:
-            filtered_data, summary, stats = fe.apply_filter_set(
-                filter_name, filter_sets[filter_name])
-            filter_info = {'name': filter_name, 'summary': summary,
-                           'stats': stats,
-                           'is_global': (filter_name == (config or {}).get('global_filter'))}
-        except Exception:
-            filtered_data = reader.get_data()
-            filter_info   = None
-    else:
-        filtered_data = reader.get_data()
-        filter_info   = None
-
-    chart_cards = []
+    results = {}
     for var_idx in selected_vars:
         if var_idx >= len(variables_list or []):
             continue
-        vc         = variables_list[var_idx]
-        var_name   = vc.get('name')
-        var_type   = vc.get('type')
-        var_label  = vc.get('label', var_name)
-
-        if var_type == 'single':
-            result = _process_single_variable(
-                reader, filtered_data, var_name, var_label,
-                filter_info, config or {},
-                json_value_labels=vc.get('value_labels'))
-            if result:
-                fig = viz.create_single_punch_chart(result, 'bar')
-        elif var_type == 'multi':
-            result = _process_multi_variable(
-                reader, filtered_data, var_name, var_label,
-                vc.get('sub_variables', []), filter_info, config or {},
-                sub_variable_labels=vc.get('sub_variable_labels', {}))
-            if result:
-                fig = viz.create_multi_punch_chart(result)
-        else:
+        vc = variables_list[var_idx]
+        if vc.get('type') not in ('single', 'multi'):
             continue
-
+        result = _variable_result(data_key, reader, filtered, filter_name,
+                                  var_idx, vc, config)
         if result:
-            chart_cards.append(_create_chart_card(result, fig, var_idx))
+            results[var_idx] = result
+    order = list(results)
 
-    if not chart_cards:
+    if not order:
         return [html.Div(html.P("⚠️ No results generated.",
                                 className="no-data-message"),
-                         className="no-data-container")], ""
+                         className="no-data-container")], "", []
 
-    status = f"✓ {len(chart_cards)} variable(s)"
+    def card(var_idx):
+        result = results[var_idx]
+        if result['type'] == 'single':
+            fig = viz.create_single_punch_chart(result, 'bar')
+        else:
+            fig = viz.create_multi_punch_chart(result)
+        return _create_chart_card(result, fig, var_idx)
+
+    status = f"✓ {len(order)} variable(s)"
     if filter_name:
         status += f" | Filter: {filter_name}"
-    return chart_cards, status
+
+    # A checklist toggle only adds or removes cards: patch those in place
+    # when the cards already on screen keep their order
+    if ctx.triggered_id == 'variable-checklist' and rendered:
+        rendered_set = set(rendered)
+        kept  = [i for i in rendered if i in results]
+        added = [i for i in order if i not in rendered_set]
+        if kept + added == order:
+            patch = Patch()
+            for pos in reversed(range(len(rendered))):
+                if rendered[pos] not in results:
+                    del patch[pos]
+            for var_idx in added:
+                patch.append(card(var_idx))
+            return patch, status, order
+
+    return [card(i) for i in order], status, order
+
+
+# ── Theme switch: recolour the rendered charts in place ───────────────────
+def _recolor_patch(viz, n_bars):
+    """Patch a ChartVisualizer bar chart's colours to viz's theme."""
+    colors = viz.bar_colors(n_bars)
+    fig = Patch()
+    fig['data'][0]['marker']['color'] = colors
+    fig['data'][0]['marker']['line']['color'] = colors
+    fig['data'][0]['textfont']['color'] = viz.theme['primary']
+    return fig
+
+
+@callback(
+    Output({'type': 'single-chart', 'index': ALL}, 'figure'),
+    Output({'type': 'multi-chart',  'index': ALL}, 'figure', allow_duplicate=True),
+    Input('store-theme',        'data'),
+    State('filter-dropdown',    'value'),
+    State('store-vars-list',    'data'),
+    State('store-filter-sets',  'data'),
+    State('store-config',       'data'),
+    State('store-spss-path-local', 'data'),
+    State('store-meta-path-local', 'data'),
+    prevent_initial_call=True,
+)
+def recolor_charts(theme_data, selected_filter, variables_list, filter_sets,
+                   config, spss_path, meta_path):
+    """Only colours depend on the theme, so send those instead of new figures."""
+    single_ids = [o['id'] for o in ctx.outputs_list[0]]
+    multi_ids  = [o['id'] for o in ctx.outputs_list[1]]
+    try:
+        _, reader, _, _, _, _ = _load_data(spss_path, meta_path)
+    except Exception:
+        return [no_update] * len(single_ids), [no_update] * len(multi_ids)
+    data_key = _data_key(spss_path, meta_path)
+
+    viz = _visualizer(theme_data)
+    filter_name = selected_filter if selected_filter != '__none__' else None
+    config = config or {}
+    filtered = _filtered_data(data_key, reader, filter_name, filter_sets or {},
+                              variables_list, config)
+
+    def patches(ids, count_bars):
+        out = []
+        for gid in ids:
+            var_idx = gid['index']
+            result = (_variable_result(data_key, reader, filtered, filter_name,
+                                       var_idx, variables_list[var_idx], config)
+                      if var_idx < len(variables_list or []) else None)
+            out.append(_recolor_patch(viz, count_bars(result['freq_table']))
+                       if result else no_update)
+        return out
+
+    # Single-punch charts leave out the Missing row; multi-punch show every row
+    return (
+        patches(single_ids, lambda ft: sum(not r.get('is_missing', False) for r in ft)),
+        patches(multi_ids, len),
+    )
 
 
 # ── Multi-punch sort ───────────────────────────────────────────────────────
@@ -534,5 +725,4 @@ def sort_multi_chart(sort_value, stored_result, theme_data):
     elif sort_value == 'count_asc':
         ft.sort(key=lambda x:  x.get(key, 0))
     result['freq_table'] = ft
-    theme = (theme_data or {}).get('theme', 'corporate_blue')
-    return ChartVisualizer(theme=theme).create_multi_punch_chart(result)
+    return _visualizer(theme_data).create_multi_punch_chart(result)
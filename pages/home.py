@@ -10,6 +10,8 @@ import dash
 from dash import html, dcc, Input, Output, State, callback, no_update, ctx
 import dash_bootstrap_components as dbc
 
+import config_builder as _cb
+
 dash.register_page(__name__, path='/', title='Home')
 
 
@@ -172,6 +174,10 @@ def validate_paths(spss_path, meta_path):
     elif meta_ok:
         msgs.append(('✅ Config file found', 'status-ok'))
 
+    if spss_ok:
+        # Start parsing metadata now so the config builder opens faster
+        _cb.prewarm_spss_meta(spss)
+
     status_el = html.Div([
         html.Div(text, className=cls) for text, cls in msgs
     ])
@@ -1,7 +1,102 @@
+import glob
+import hashlib
+import os
+import pickle
+import tempfile
+import time
+
 import pyreadstat
 import pandas as pd
 
 
+# Parsed .sav files can also be pickled to a private temp-dir cache keyed on
+# path, mtime and size, so reopening an unchanged file skips pyreadstat.
+# Only the newest version of each file is kept, and the oldest entries are
+# removed once the directory passes _CACHE_MAX_BYTES. Writing an entry adds
+# a full pickle to the first read, so it is opt-in: app.py --data-cache.
+DISK_CACHE = False
+_CACHE_DIR = os.path.join(tempfile.gettempdir(), "spss_freq_dashboard_data")
+_CACHE_MAX_BYTES = 2 * 1024 ** 3
+_TMP_MAX_AGE = 3600  # seconds before an unfinished write counts as abandoned
+
+
+def _cache_path(file_path):
+    """<path digest>-<version digest>.pkl, so older versions share a prefix."""
+    st = os.stat(file_path)
+    path_digest = hashlib.sha1(os.path.abspath(file_path).encode("utf-8")).hexdigest()
+    version = hashlib.sha1(repr((st.st_mtime_ns, st.st_size)).encode("utf-8")).hexdigest()
+    return os.path.join(_CACHE_DIR, f"{path_digest}-{version[:16]}.pkl")
+
+
+def _load_cached(cache_path):
+    """Return (data, metadata) from the cache, or None on any miss."""
+    try:
+        # Only unpickle from a directory this user owns and no one else can write
+        if hasattr(os, "getuid"):
+            st = os.stat(_CACHE_DIR)
+            if st.st_uid != os.getuid() or st.st_mode & 0o022:
+                return None
+        with open(cache_path, "rb") as f:
+            return pickle.load(f)
+    except Exception:
+        return None
+
+
+def _save_cached(cache_path, data, metadata):
+    # A frame that is already over the cap would only evict everything else
+    if data.memory_usage(index=True).sum() > _CACHE_MAX_BYTES:
+        return
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(_CACHE_DIR, mode=0o700, exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            pickle.dump((data, metadata), f, protocol=pickle.HIGHEST_PROTOCOL)
+        if os.path.getsize(tmp_path) <= _CACHE_MAX_BYTES:
+            os.replace(tmp_path, cache_path)
+            _prune_cache(cache_path)
+    except Exception:
+        pass  # caching is best-effort
+    finally:
+        try:
+            os.remove(tmp_path)  # only still there if the write was not kept
+        except OSError:
+            pass
+
+
+def _prune_cache(keep_path):
+    """Drop older versions of keep_path's file, then the oldest entries over the size cap."""
+    path_prefix = os.path.basename(keep_path).split("-", 1)[0]
+    # Writes left behind by a crashed or killed process
+    stale_before = time.time() - _TMP_MAX_AGE
+    for tmp in glob.glob(os.path.join(_CACHE_DIR, "*.tmp")):
+        try:
+            if os.stat(tmp).st_mtime < stale_before:
+                os.remove(tmp)
+        except OSError:
+            pass
+    entries = []
+    for entry in glob.glob(os.path.join(_CACHE_DIR, "*.pkl")):
+        try:
+            if entry != keep_path and os.path.basename(entry).startswith(f"{path_prefix}-"):
+                os.remove(entry)
+            else:
+                st = os.stat(entry)
+                entries.append((st.st_mtime, st.st_size, entry))
+        except OSError:
+            pass
+    total = sum(size for _, size, _ in entries)
+    for _, size, entry in sorted(entries):
+        if total <= _CACHE_MAX_BYTES:
+            break
+        if entry == keep_path:
+            continue
+        try:
+            os.remove(entry)
+            total -= size
+        except OSError:
+            pass
+
+
 class SPSSReader:
     """Reads SPSS files and extracts data with metadata"""
     
@@ -29,8 +124,15 @@ class SPSSReader:
         try:
             print(f"\nReading SPSS file: {self.file_path}")
             
-            # Read SPSS file with metadata
-            self.data, self.metadata = pyreadstat.read_sav(self.file_path)
+            # Read SPSS file with metadata (from the parse cache when unchanged)
+            cache_path = _cache_path(self.file_path) if DISK_CACHE else None
+            cached = _load_cached(cache_path) if cache_path else None
+            if cached is not None:
+                self.data, self.metadata = cached
+            else:
+                self.data, self.metadata = pyreadstat.read_sav(self.file_path)
+                if cache_path:
+                    _save_cached(cache_path, self.data, self.metadata)
             
             # Extract useful metadata
             self.value_labels = self.metadata.variable_value_labels 
@@ -164,4 +266,24 @@ if __name__ == "__main__":
             if value_labels:
                 print(f"\nValue labels for '{first_col}':")
                 for value, label in value_labels.items():
-                    print(f"  {value}: {label}")
\ No newline at end of file
+                    print(f"  {value}: {label}")
+
+        # Re-saving the .sav replaces its cache entry instead of adding one,
+        # and abandoned temp files are cleared on the next write
+        import shutil
+        DISK_CACHE = True
+        with tempfile.TemporaryDirectory() as _CACHE_DIR:
+            sav_copy = os.path.join(_CACHE_DIR, "copy.sav")
+            shutil.copy(spss_file, sav_copy)
+            SPSSReader(sav_copy).read()
+            stale = _cache_path(sav_copy)
+            abandoned = f"{stale}.0.tmp"
+            open(abandoned, "wb").close()
+            os.utime(abandoned, (0, 0))
+            st = os.stat(sav_copy)
+            os.utime(sav_copy, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+            SPSSReader(sav_copy).read()
+            fresh = _cache_path(sav_copy)
+            assert fresh != stale and not os.path.exists(stale)
+            assert sorted(os.listdir(_CACHE_DIR)) == sorted(["copy.sav", os.path.basename(fresh)])
+        print("\n✓ Stale cache entry replaced")
\ No newline at end of file
@@ -255,6 +255,10 @@ class ChartVisualizer:
         
         return fig
     
+    def bar_colors(self, n):
+        """Bar colours for an n-bar chart in the current theme"""
+        return self._generate_gradient_colors(n)
+    
     def _generate_gradient_colors(self, n):
         """Generate gradient colors from theme"""
         if n == 1: